@@ -9,7 +9,6 @@ from typing import List
 from naive_backlink.config import load_config  # Import the new config loader
 from naive_backlink.crawler import Crawler as HttpxCrawler
 from naive_backlink.models import EvidenceRecord, Result
-from naive_backlink.playwright_crawler import Crawler as PlaywrightCrawler
 from naive_backlink.scoring import calculate_score
 
 log = logging.getLogger(__name__)
@@ -85,6 +84,10 @@ async def crawl_and_score(
             )
             # Clear any errors from the first attempt before retrying
             errors.clear()
+            # Imported here: Playwright is slow to import and most runs never
+            # reach the fallback.
+            from naive_backlink.playwright_crawler import Crawler as PlaywrightCrawler
+
             async with PlaywrightCrawler(
                 origin_url, config, seed_urls=seed_urls
             ) as playwright_crawler:
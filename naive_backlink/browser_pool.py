@@ -0,0 +1,117 @@
+# naive_backlink/browser_pool.py
+"""
+One warm Chromium per process, shared by every Playwright crawler.
+
+Launching Chromium costs about a second or more. A browser context is far
+cheaper, so each Crawler takes a fresh context from the shared browser
+(isolated cookies/cache) and closes only that context when it is done.
+
+The pool is reference counted: every get_browser() is paired with a
+release_browser(), and the last release closes the browser. Crawlers running
+at the same time share one browser, and none of them closes it under another.
+A caller that runs crawls back to back can hold its own reference to keep the
+browser warm between them.
+
+Playwright objects belong to the loop that created them. If the pool is used
+from a different loop, the stale handles can no longer be awaited; they are
+forgotten (with a warning) and a new browser is launched.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+log = logging.getLogger(__name__)
+
+# Chromium flags for container/CI hosts with a tiny /dev/shm. The sandbox stays
+# on: the browser renders arbitrary third-party pages.
+LAUNCH_ARGS = ["--disable-dev-shm-usage"]
+
+_lock: asyncio.Lock | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_playwright: Playwright | None = None
+_browser: Browser | None = None
+_users = 0  # get_browser() calls not yet matched by release_browser()
+
+
+def _forget_stale_handles() -> None:
+    """Drop handles owned by another (usually closed) event loop."""
+    global _lock, _loop, _playwright, _browser, _users
+    if _playwright is not None:
+        log.warning(
+            "Shared browser belongs to another event loop; "
+            "abandoning it and launching a new one."
+        )
+    _lock = None
+    _loop = None
+    _playwright = None
+    _browser = None
+    _users = 0
+
+
+async def _shutdown() -> None:
+    """Close the browser and stop Playwright. Caller holds _lock."""
+    global _playwright, _browser
+    browser, playwright = _browser, _playwright
+    _browser = None
+    _playwright = None
+    try:
+        if browser is not None:
+            await browser.close()
+    finally:
+        if playwright is not None:
+            await playwright.stop()
+            log.info("Shared headless browser closed.")
+
+
+async def get_browser() -> Browser:
+    """
+    Return the shared headless Chromium, launching it on first use. Each call
+    must be matched by a release_browser().
+    """
+    global _lock, _loop, _playwright, _browser, _users
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        _forget_stale_handles()
+        _lock = asyncio.Lock()
+        _loop = loop
+    assert _lock is not None
+    async with _lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            log.info("Launching shared headless browser...")
+            _browser = await _playwright.chromium.launch(
+                headless=True, args=LAUNCH_ARGS
+            )
+        _users += 1
+    return _browser
+
+
+async def release_browser() -> None:
+    """Drop one reference taken by get_browser(); the last one closes the browser."""
+    global _users
+    if _loop is not asyncio.get_running_loop() or _users == 0:
+        return  # handles were forgotten after a loop change; nothing to release
+    assert _lock is not None
+    async with _lock:
+        _users -= 1
+        if _users == 0:
+            await _shutdown()
+
+
+async def close_browser() -> None:
+    """
+    Close the shared browser now, whoever still holds it (no-op if never
+    started). Meant for process shutdown; crawlers use release_browser().
+    """
+    global _users
+    if _loop is not asyncio.get_running_loop():
+        _forget_stale_handles()  # can't be awaited from here
+        return
+    assert _lock is not None
+    async with _lock:
+        _users = 0
+        await _shutdown()
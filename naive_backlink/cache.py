@@ -9,17 +9,33 @@ File-backed HTTP response cache.
 from __future__ import annotations
 
 import dataclasses
+import functools
 import logging
 import os
 from pathlib import Path
 from typing import Any, Optional
 
 import diskcache
-from platformdirs import user_cache_dir as _user_cache_dir
 
 log = logging.getLogger(__name__)
 
 
+def _user_cache_dir(app_name: str, appauthor: bool = False) -> str:
+    # Imported on use: only the "os-default" directory needs platformdirs.
+    from platformdirs import user_cache_dir
+
+    return user_cache_dir(app_name, appauthor)
+
+
+@functools.lru_cache(maxsize=256)
+def _lower(s: str) -> str:
+    """
+    str.lower() for header names and content types. Both come from a small set
+    that repeats on every response, so they are lowercased once per process.
+    """
+    return s.lower()
+
+
 @dataclasses.dataclass
 class CacheConfig:
     enabled: bool = True
@@ -55,12 +71,9 @@ class FileCache:
             return
         directory = self.cfg.directory
         if directory == "os-default":
-            if _user_cache_dir is not None:
-                directory = _user_cache_dir(self.app_name, appauthor=False)
-            else:
-                directory = ".naive_backlink_cache"  # fallback visible
+            directory = _user_cache_dir(self.app_name, appauthor=False)
 
-        log.warning(f"Cache at {directory}")
+        log.warning("Cache at %s", directory)
         self._cache = diskcache.Cache(directory)
         if self._cache is None:
             raise Exception("create failed.")
@@ -149,17 +162,17 @@ class FileCache:
             log.warning("Cache disabled, no self._cache")
             return
         if status != 200 and not self.cfg.store_errors:
-            log.warning(f"Not caching error, got {status}")
+            log.warning("Not caching error, got %s", status)
             return
         self._cache.set(
             url,
             {
                 "final_url": final_url,
                 "status": status,
-                "headers": {k.lower(): v for k, v in (headers or {}).items()},
+                "headers": {_lower(k): v for k, v in (headers or {}).items()},
                 "text": text,
                 "content_type": (
-                    content_type.lower() if isinstance(content_type, str) else ""
+                    _lower(content_type) if isinstance(content_type, str) else ""
                 ),
             },
             expire=self.cfg.expire_seconds,
@@ -13,17 +13,16 @@ from datetime import datetime
 from pathlib import Path
 from typing import IO, Any, Sequence, Set
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # type: ignore
+
 from naive_backlink import __version__
 from naive_backlink.api import crawl_and_score
 from naive_backlink.cache import CacheConfig, FileCache
-from naive_backlink.models import Result
-from naive_backlink.ui import (
-    render_errors_section,
-    render_evidence_section,
-    render_link_graph_section,
-    render_score_line,
-    render_verify_header,
-)
+from naive_backlink.models import INDIRECT, STRONG, WEAK, Result
+from naive_backlink.ui import render_report, render_verify_header
 
 log = logging.getLogger(__name__)
 
@@ -38,11 +37,11 @@ def _load_seed_urls(path: str | None) -> list[str]:
         return []
     p = Path(path)
     if not p.exists():
-        log.error(f"Error: The file specified could not be found: {path}")
+        log.error("Error: The file specified could not be found: %s", path)
         raise FileNotFoundError(path)
     with p.open("r", encoding="utf-8") as f:
         lines = [line.strip() for line in f if line.strip()]
-    log.info(f"Loaded {len(lines)} candidate URLs from {path}")
+    log.info("Loaded %d candidate URLs from %s", len(lines), path)
     return lines
 
 
@@ -57,7 +56,11 @@ def _json_default(o: Any) -> Any:
 
 def _build_link_graph_inputs(
     result: Result,
-) -> tuple[str | None, Set[str], dict[str, list[str]]]:
+) -> tuple[str | None, list[str], dict[str, list[str]]]:
+    """
+    (origin, direct pivots, pivot -> neighbors) for render_link_graph_section,
+    deduplicated and sorted once here so the renderer only iterates.
+    """
     origin = None
     if result.evidence:
         # all evidence shares same origin URL in this model
@@ -68,9 +71,9 @@ def _build_link_graph_inputs(
 
     for ev in result.evidence:
         cls = (ev.classification or "").lower()
-        if cls in ("strong", "weak"):
+        if cls in (STRONG, WEAK):
             direct.add(ev.target.url)
-        elif cls == "indirect" and ev.notes:
+        elif cls == INDIRECT and ev.notes:
             # expected note format includes "pivot=<B> chain=A<->B<->C"
             pivot = None
             try:
@@ -81,9 +84,12 @@ def _build_link_graph_inputs(
                 # keep silent but do not crash CLI; leave pivot as None
                 pivot = None
             if pivot:
-                edges.setdefault(pivot, []).append(ev.target.url)
+                children = edges.get(pivot)
+                if children is None:
+                    children = edges[pivot] = []
+                children.append(ev.target.url)
 
-    return origin, direct, edges
+    return origin, sorted(direct), {b: sorted(cs) for b, cs in edges.items()}
 
 
 def _add_common_args(parser: argparse.ArgumentParser) -> None:
@@ -260,20 +266,13 @@ async def async_main(
         render_verify_header(args.url, file=stdout)
         result = await crawl_and_score(**api_kwargs)  # type: ignore
 
-        render_score_line(result, file=stdout)
-        render_evidence_section(result, file=stdout)
-
-        origin, direct, edges = _build_link_graph_inputs(result)
-        render_link_graph_section(origin, direct, edges, file=stdout)
-
-        if result.errors:
-            render_errors_section(result.errors, file=stdout)
+        stdout.write(render_report(result, *_build_link_graph_inputs(result)))
 
         # Return specific exit codes based on results.
         if not result.evidence and not result.errors:
             return 100  # No backlinks found
         if result.evidence and all(
-            (e.classification or "").lower() == "weak" for e in result.evidence
+            (e.classification or "").lower() == WEAK for e in result.evidence
         ):
             return 0  # Only weak backlinks (non-failure for CI usage)
 
@@ -290,7 +289,14 @@ async def async_main(
 
 
 def main(argv: Sequence[str] | None = None) -> int:
-    """Synchronous wrapper for the CLI entry point."""
+    """
+    Synchronous wrapper for the CLI entry point.
+
+    Runs on uvloop when it is installed (libuv-based, faster socket dispatch for
+    the many concurrent fetches a crawl makes); otherwise on the default loop.
+    """
+    if uvloop is not None:
+        return uvloop.run(async_main(argv))
     return asyncio.run(async_main(argv))
 
 
@@ -5,6 +5,7 @@ Centralized configuration management.
 Handles loading defaults, merging in settings from pyproject.toml,
 and applying runtime overrides.
 """
+
 from __future__ import annotations
 
 import logging
@@ -44,6 +45,25 @@ DEFAULT_CONFIG: dict[str, Any] = {
     "max_outlinks": 50,
     "timeout": 10.0,
     "max_content_bytes": 1_048_576,  # 1 MiB
+    # httpx crawler: max fetches in flight at once (same-domain fetches are
+    # always serialized; this caps the cross-domain fan-out).
+    "max_global_concurrency": 16,
+    # httpx crawler: keep visited URLs in a Bloom filter (~2 MB per million
+    # URLs) instead of a set. Only worth it on huge crawls. With expected_urls
+    # unset the filter starts at 10k URLs and grows; set it to preallocate.
+    "use_bloom": False,
+    "expected_urls": None,
+    # httpx crawler: JSON file holding visited/queued URLs and evidence. Read on
+    # start (same origin and crawl settings only) and written on exit, so an
+    # interrupted or repeated crawl resumes instead of re-fetching. Delete the
+    # file to start over.
+    "state_path": None,
+    # Playwright fallback: pages rendered in parallel (each is a browser tab).
+    "playwright_concurrency": 4,
+    # Playwright fallback: stop waiting at the first response byte plus a short
+    # grace period instead of DOMContentLoaded (which waits on blocking scripts).
+    # Enough for server-rendered links; may miss script-inserted ones.
+    "quick_nav": False,
     "user_agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
@@ -25,24 +25,31 @@ from typing import Any, Deque, Dict, List, Set
 from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
+
+try:
+    import h2  # noqa: F401  # enables httpx HTTP/2 (pip install httpx[http2])
+except ImportError:
+    h2 = None  # type: ignore
 
 from naive_backlink.cache import CacheConfig, FileCache
+from naive_backlink.frontier import HopQueue, VisitedSet
 from naive_backlink.link_logic import (
+    HrefElement,
     LogicConfig,
+    _registrable_domain_or,
     _rel_list,
-    detect_backlink_element,
-    extract_href_elements,
-    is_blacklisted,
-    is_fetchable_url,
-    is_probably_html_url,
+    index_links,
+    is_crawlable_url,
     make_evidence,
     make_indirect_evidence,
     normalize_url,
+    parse_links,
+    pivot_neighbors,
     queue_candidates_from_origin,
     queue_candidates_from_pivot,
 )
 from naive_backlink.models import EvidenceRecord
+from naive_backlink.state import load_crawl_state, save_crawl_state
 
 log = logging.getLogger(__name__)
 
@@ -58,17 +65,8 @@ def _domain_group(url: str, use_registrable: bool) -> str:
     if not host:
         return ""  # unknown -> serialized anyway under empty key
     if use_registrable:
-        try:
-            import tldextract  # type: ignore
-
-            ext = tldextract.extract(host)
-            if ext.registered_domain:
-                return ext.registered_domain.lower()
-        except Exception:
-            # Log once per process would be ideal; keep it cheap:
-            log.debug(
-                "tldextract unavailable/failure; falling back to host for %s", host
-            )
+        # Shares link_logic's memoized lookup; returns host unchanged on failure.
+        return _registrable_domain_or(host, fallback_to_host=False)
     return host.lower()
 
 
@@ -90,6 +88,10 @@ class Crawler:
       - only_rel_me: bool
       - whitelist: list[str]
       - blacklist: list[str]
+      - max_global_concurrency: int (fetches in flight across all domains)
+      - use_bloom: bool (track visited URLs in a Bloom filter, for huge crawls)
+      - expected_urls: int | None (preallocated Bloom size; None grows on demand)
+      - state_path: str | None (JSON file to resume the crawl from and save it to)
       ...
     """
 
@@ -98,8 +100,12 @@ class Crawler:
     seed_urls: List[str] | None = None
 
     # Internal state
-    queue: Deque[tuple[str, int]] = field(default_factory=deque)
-    visited_urls: Set[str] = field(default_factory=set)
+    # BFS frontier; popleft() always returns the lowest pending hop
+    queue: HopQueue = field(default_factory=HopQueue)
+    # URLs waiting in `queue` or a per-domain waiting line; O(1) dedup at enqueue
+    queued_urls: Set[str] = field(default_factory=set)
+    # Swapped for a VisitedSet (membership-only, flat memory) when use_bloom is set
+    visited_urls: Set[str] | VisitedSet = field(default_factory=set)
     evidence_producing_urls: Set[str] = field(default_factory=set)
     evidence: List[EvidenceRecord] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
@@ -109,12 +115,12 @@ class Crawler:
     pivot_has_backlink_to_origin: Set[str] = field(
         default_factory=set
     )  # B that link to A
-    pivot_outlinked: Dict[str, Set[str]] = field(default_factory=dict)  # B -> {C}
 
     # HTTP client + derived
     _client: httpx.AsyncClient = field(init=False, repr=False)
     normalized_origin_url: str = field(init=False)
     _cache: FileCache | None = field(default=None, init=False, repr=False)
+    _logic_cfg: LogicConfig = field(init=False, repr=False)
 
     async def __aenter__(self) -> "Crawler":
         headers = {
@@ -134,45 +140,135 @@ class Crawler:
         )
         self._cache = FileCache(cc)
 
+        # Size the pool from the scheduler's cap so finished connections are kept
+        # alive for the next same-host fetch instead of re-handshaking. HTTP/2
+        # only when h2 is installed; Accept-Encoding is left to httpx, which
+        # advertises br/zstd when their decoders are installed. No explicit
+        # transport=: httpx only honors HTTP(S)_PROXY / ALL_PROXY without one.
+        max_global = int(self.config.get("max_global_concurrency", 16))
+        timeout = float(self.config.get("timeout", 10.0))
         self._client = httpx.AsyncClient(
             follow_redirects=True,
-            timeout=self.config.get("timeout", 10.0),
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
             headers=headers,
+            http2=h2 is not None,
+            limits=httpx.Limits(
+                max_connections=max_global * 4,
+                max_keepalive_connections=max_global * 2,
+                keepalive_expiry=30.0,
+            ),
         )
 
         self.normalized_origin_url = normalize_url(self.origin_url)
+        self._logic_cfg = self._build_logic_config()
+        if self.config.get("use_bloom", False):
+            expected = self.config.get("expected_urls")
+            self.visited_urls = VisitedSet(
+                expected_urls=int(expected) if expected else None
+            )
+        if self.config.get("state_path"):
+            self._restore_state(self.config["state_path"])
 
         # Initialize BFS queue
         if self.seed_urls:
             # Treat provided seeds as first-hop candidates
             self.visited_urls.add(self.normalized_origin_url)
             for url in self.seed_urls:
-                self.queue.append((normalize_url(url), 1))
-        else:
+                url = normalize_url(url)
+                if self._admit(url) and url not in self.queued_urls:
+                    self.queue.append((url, 1))
+                    self.queued_urls.add(url)
+        elif self._admit(self.normalized_origin_url):
             # Start at the origin page
             self.queue.append((self.normalized_origin_url, 0))
+            self.queued_urls.add(self.normalized_origin_url)
 
         log.info("httpx session initialized. Origin: %s", self.normalized_origin_url)
         return self
 
+    def _restore_state(self, path: str) -> None:
+        """Resume from a previous run's state_path file (see naive_backlink.state)."""
+        data = load_crawl_state(path, self.normalized_origin_url, self.config)
+        if data is None:
+            return
+        for url in data["visited"]:
+            self.visited_urls.add(url)
+        for url, hops in data["queued"]:
+            if url not in self.queued_urls:
+                self.queue.append((url, hops))
+                self.queued_urls.add(url)
+        self.parent.update(data["parent"])
+        self.pivot_has_backlink_to_origin.update(data["pivots"])
+        self.evidence.extend(data["evidence"])
+        self.evidence_producing_urls.update(data["evidence_producing"])
+        self.errors.extend(data["errors"])
+        log.info(
+            "Resumed crawl state from %s: %d visited, %d queued, %d evidence.",
+            path,
+            len(data["visited"]),
+            len(data["queued"]),
+            len(self.evidence),
+        )
+
+    def _save_state(
+        self, path: str, pending: List[tuple[str, int]], interrupted: Set[str]
+    ) -> None:
+        """
+        Write state for the next run. `pending` are URLs not yet fetched;
+        `interrupted` were mid-fetch when the crawl stopped and are re-queued.
+        """
+        if isinstance(self.visited_urls, VisitedSet):
+            log.warning("state_path is not supported with use_bloom; not saving.")
+            return
+        save_crawl_state(
+            path,
+            self.normalized_origin_url,
+            {
+                "visited": set(self.visited_urls) - interrupted,
+                "queued": pending,
+                "parent": self.parent,
+                "pivots": self.pivot_has_backlink_to_origin,
+                "evidence": self.evidence,
+                "evidence_producing": self.evidence_producing_urls,
+                "errors": self.errors,
+            },
+            self.config,
+        )
+        log.info("Saved crawl state to %s (%d pending).", path, len(pending))
+
+    def _build_logic_config(self) -> LogicConfig:
+        return LogicConfig(
+            max_outlinks=self.config.get("max_outlinks", 50),
+            trusted_domains=self.config.get("trusted", []),
+            same_domain_policy=self.config.get("same_domain_policy", "no-self-domain"),
+            use_registrable_domain=self.config.get("use_registrable_domain", False),
+            blacklist_patterns=self.config.get("blacklist", []),
+            whitelist_patterns=self.config.get("whitelist", []),
+            only_whitelist=self.config.get("only_whitelist", False),
+        )
+
+    def _admit(self, url: str) -> bool:
+        """Enqueue-time filter: only fetchable, likely-HTML, non-blacklisted URLs."""
+        if not is_crawlable_url(url, self._logic_cfg):
+            log.info("Not queueing non-HTML, non-http(s) or blacklisted URL: %s", url)
+            return False
+        return True
+
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         await self._client.aclose()
         if self._cache:
             self._cache.close()  # NEW
         log.info("httpx session closed.")
 
-    async def _fetch_and_parse(self, url: str) -> BeautifulSoup | None:
+    async def _fetch_and_parse(self, url: str) -> List[HrefElement] | None:
         """
-        Fetch a URL and return a BeautifulSoup tree, or None on error/non-HTML/too-large.
+        Fetch a URL and return its <a>/<link> elements, or None on
+        error/non-HTML/too-large.
         Honors on-disk cache for successful 200 text/html responses.
-        """
-        if not is_fetchable_url(url):
-            log.info("Skipping non-fetchable URL (scheme not http/https): %s", url)
-            return None
 
-        if not is_probably_html_url(url):
-            log.info("Skip non-HTML by extension: %s", url)
-            return None
+        Scheme, extension and blacklist filtering already happened at enqueue time
+        (see _admit), so only the visited check remains here.
+        """
         if url in self.visited_urls:
             return None
         self.visited_urls.add(url)
@@ -190,43 +286,55 @@ class Crawler:
                 if not text:
                     log.debug("Cached entry missing body; ignoring.")
                 else:
-                    return BeautifulSoup(text, "html.parser")
+                    return await self._parse(text)
 
         try:
-            resp = await self._client.get(url)
-            status = resp.status_code
-
-            if status != 200:
-                # Still raise_for_status for uniform handling of 4xx/5xx
-                log.warning("Non-200 response for %s: %d", url, status)
-            resp.raise_for_status()
-
-            ctype = resp.headers.get("content-type", "").lower()
-            if "text/html" not in ctype:
-                log.info("Skipping non-HTML content at %s (%s)", url, ctype)
-                return None
-
-            # It's been downloaded. Might as well look at it.
-            # max_bytes = self.config.get("max_content_bytes", 1024 * 1024)
-            # if len(resp.content) > max_bytes:
-            #     msg = f"Content too large at {url} ({len(resp.content)} > {max_bytes})"
-            #     log.warning(msg)
-            #     self.errors.append(msg)
-            #     return None
+            # Stream so an oversized page is cut off at max_content_bytes instead of
+            # being fully downloaded and held in memory before we reject it.
+            async with self._client.stream("GET", url) as resp:
+                status = resp.status_code
+
+                if status != 200:
+                    # Still raise_for_status for uniform handling of 4xx/5xx
+                    log.warning("Non-200 response for %s: %d", url, status)
+                resp.raise_for_status()
+
+                # Decide on headers alone before reading any of the body.
+                ctype = resp.headers.get("content-type", "").lower()
+                if "text/html" not in ctype:
+                    log.info("Skipping non-HTML content at %s (%s)", url, ctype)
+                    return None
+
+                max_bytes = self.config.get("max_content_bytes", 1024 * 1024)
+                declared = resp.headers.get("content-length", "")
+                if declared.isdigit() and int(declared) > max_bytes:
+                    self._record_too_large(url, int(declared), max_bytes)
+                    return None
+
+                buf = bytearray()
+                async for chunk in resp.aiter_bytes():
+                    buf += chunk
+                    if len(buf) > max_bytes:
+                        self._record_too_large(url, len(buf), max_bytes)
+                        return None
+                body = bytes(buf)
+                final_url = str(resp.url)
+                encoding = resp.encoding or "utf-8"
 
             # ---- NEW: cache store (200 + text/html) ----
 
             if self._cache is not None:
                 self._cache.set_html_ok(
                     url,
-                    final_url=str(resp.url),
+                    final_url=final_url,
                     status=status,
                     headers=dict(resp.headers),
-                    text=resp.text,
+                    text=body.decode(encoding, errors="replace"),
                     content_type=ctype,
                 )
 
-            return BeautifulSoup(resp.text, "html.parser")
+            # bytes, not text: the parser handles the encoding declaration itself
+            return await self._parse(body)
 
         except httpx.HTTPStatusError as e:
             msg = f"HTTP error for {url}: {e}"
@@ -245,6 +353,20 @@ class Crawler:
             # Only return None on expected errors. Everything else is a bug.
             raise
 
+    async def _parse(self, markup: str | bytes) -> List[HrefElement]:
+        """
+        Parse and extract links in the default thread pool so a large page doesn't
+        stall every other in-flight fetch; lxml releases the GIL while it parses.
+        Only plain HrefElements come back; the soup is dropped in the thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, parse_links, markup)
+
+    def _record_too_large(self, url: str, size: int, max_bytes: int) -> None:
+        msg = f"Content too large at {url} ({size} > {max_bytes})"
+        log.warning(msg)
+        self.errors.append(msg)
+
     # --- NEW: encapsulate per-URL processing (was inline in crawl loop) -------------
 
     async def _process_url(
@@ -255,19 +377,14 @@ class Crawler:
         only_rel_me: bool,
         max_hops: int,
     ) -> None:
-        # Whitelist handled in link_logic queue_*; enforce blacklist early:
-        if is_blacklisted(current_url, cfg):
-            log.info("Skipping blacklisted URL: %s", current_url)
-            return
-
+        # Whitelist handled in link_logic queue_*; blacklist handled by _admit.
         if hops >= max_hops:
             return
 
-        soup = await self._fetch_and_parse(current_url)
-        if not soup:
+        elements = await self._fetch_and_parse(current_url)
+        if elements is None:
             return
 
-        elements = extract_href_elements(soup)
         is_origin_page = current_url == self.normalized_origin_url
 
         if is_origin_page:
@@ -277,19 +394,22 @@ class Crawler:
                 origin_url=self.normalized_origin_url,
                 elements=elements,
                 cfg=cfg,
-                already_queued=(u for (u, _) in self._queued_urls),  # NEW
+                already_queued=self.queued_urls,
                 visited=self.visited_urls,
             )
             for url in next_candidates:
                 self._enqueue(url, hops + 1)  # NEW
             return
 
+        # One resolve/normalize pass serves both the B → A and C → B checks, and
+        # stops as soon as both targets are found.
+        wanted = {self.normalized_origin_url}
+        if current_url in self.parent:
+            wanted.add(self.parent[current_url])
+        links = index_links(current_url, elements, wanted)
+
         # B → A direct backlink?
-        tag = detect_backlink_element(
-            current_url=current_url,
-            origin_url=self.normalized_origin_url,
-            elements=elements,
-        )
+        tag = links.get(self.normalized_origin_url)
 
         if tag is not None and only_rel_me:
             rels = _rel_list(tag)
@@ -320,26 +440,18 @@ class Crawler:
                 origin_url=self.normalized_origin_url,
                 elements=elements,
                 cfg=cfg,
-                already_queued=(u for (u, _) in self._queued_urls),  # NEW
+                already_queued=self.queued_urls,
                 visited=self.visited_urls,
             )
-            if next_neighbors:
-                self.pivot_outlinked.setdefault(current_url, set()).update(
-                    next_neighbors
-                )
-                for c in next_neighbors:
-                    if c not in self.parent:
-                        self.parent[c] = current_url
-                    self._enqueue(c, hops + 1)  # NEW
+            for c in next_neighbors:
+                if c not in self.parent:
+                    self.parent[c] = current_url
+                self._enqueue(c, hops + 1)  # NEW
 
         # Indirect C ↔ B (only if we already queued C from B)
         if current_url in self.parent:
             pivot_url = self.parent[current_url]
-            tag_to_pivot = detect_backlink_element(
-                current_url=current_url,
-                origin_url=pivot_url,
-                elements=elements,
-            )
+            tag_to_pivot = links.get(pivot_url)
             # --- NEW: Check for only_rel_me mode (for indirect) ---
             # We only apply rel-me logic to the *direct* B->A link,
             # not the C->B link. The B->A check was already done above.
@@ -369,31 +481,26 @@ class Crawler:
 
     # --- NEW: enqueue helper that avoids double-scheduling --------------------------
     def _enqueue(self, url: str, hops: int) -> None:
-        url = normalize_url(url)
+        # `url` comes from queue_candidates_*, which already return normalized URLs.
         if url in self.visited_urls:
             return
-        if url in self._scheduled_urls:
+        if url in self._scheduled_urls or url in self.queued_urls:
+            return
+        if not self._admit(url):
             return
         self.queue.append((url, hops))
-        # `_queued_urls` mirrors `queue` but as a set for O(1) lookups
-        self._queued_urls.add((url, hops))
+        self.queued_urls.add(url)
 
     # --- REPLACED: crawl() with per-domain parallelism ------------------------------
     async def crawl(self) -> None:
         """
         Parallel crawl with per-domain concurrency=1.
-        Cross-domain requests run concurrently; same-domain requests are serialized.
+        Cross-domain requests run concurrently (up to max_global_concurrency);
+        same-domain requests are serialized. A URL is marked scheduled before its
+        task starts, so the same URL is never fetched twice concurrently.
         """
 
-        cfg = LogicConfig(
-            max_outlinks=self.config.get("max_outlinks", 50),
-            trusted_domains=self.config.get("trusted", []),
-            same_domain_policy=self.config.get("same_domain_policy", "no-self-domain"),
-            use_registrable_domain=self.config.get("use_registrable_domain", False),
-            blacklist_patterns=self.config.get("blacklist", []),
-            whitelist_patterns=self.config.get("whitelist", []),
-            only_whitelist=self.config.get("only_whitelist", False),
-        )
+        cfg = self._logic_cfg
         only_rel_me = self.config.get("only_rel_me", False)
         max_hops = self.config.get("max_hops", 3)
 
@@ -402,12 +509,11 @@ class Crawler:
         domain_sems: dict[str, asyncio.Semaphore] = {}
         waiting_by_domain: dict[str, Deque[tuple[str, int]]] = {}
         in_flight: set[asyncio.Task] = set()
+        # url -> hops for tasks started but not finished; re-queued by state_path
+        running: dict[str, int] = {}
 
         # De-dup helpers
         self._scheduled_urls: Set[str] = set()
-        self._queued_urls: Set[tuple[str, int]] = set()
-        for item in list(self.queue):
-            self._queued_urls.add(item)
 
         queue_event = asyncio.Event()
 
@@ -429,13 +535,17 @@ class Crawler:
 
         def start_task(url: str, hops: int) -> None:
             """Start a task immediately (assumes domain semaphore currently available)."""
+            self.queued_urls.discard(url)
             self._scheduled_urls.add(url)
+            running[url] = hops
             t = asyncio.create_task(run_one(url, hops))
             in_flight.add(t)
 
             def _done_cb(task: asyncio.Task, u=url) -> None:
                 in_flight.discard(task)
                 self._scheduled_urls.discard(u)
+                if not task.cancelled():
+                    running.pop(u, None)
                 # After a domain task finishes, if that domain has waiting items, start one now.
                 key = _domain_group(u, cfg.use_registrable_domain)
                 dq = waiting_by_domain.get(key)
@@ -465,6 +575,7 @@ class Crawler:
                 while dq and not sem.locked() and len(in_flight) < max_global:
                     url, hops = dq.popleft()
                     if url in self.visited_urls or url in self._scheduled_urls:
+                        self.queued_urls.discard(url)
                         continue
                     start_task(url, hops)
                     started += 1
@@ -479,8 +590,8 @@ class Crawler:
             started = 0
             while self.queue and len(in_flight) < max_global:
                 url, hops = self.queue.popleft()
-                self._queued_urls.discard((url, hops))
                 if url in self.visited_urls or url in self._scheduled_urls:
+                    self.queued_urls.discard(url)
                     continue
                 key = _domain_group(url, cfg.use_registrable_domain)
                 ensure_domain_structs(key)
@@ -519,6 +630,18 @@ class Crawler:
                 for t in list(in_flight):
                     t.cancel()
                 await asyncio.gather(*in_flight, return_exceptions=True)
+            state_path = self.config.get("state_path")
+            if state_path:
+                pending = list(self.queue)
+                for dq in waiting_by_domain.values():
+                    pending.extend(dq)
+                pending.extend(running.items())
+                self._save_state(state_path, pending, set(running))
+
+    @property
+    def pivot_outlinked(self) -> Dict[str, Set[str]]:
+        """B -> {C} view of `parent`, built on demand (see pivot_neighbors)."""
+        return pivot_neighbors(self.parent)
 
     def get_results(self) -> tuple[List[EvidenceRecord], List[str]]:
         """Return accumulated evidence and errors."""
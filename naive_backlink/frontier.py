@@ -0,0 +1,196 @@
+# naive_backlink/frontier.py
+"""
+Crawl-frontier data structures.
+
+- BloomFilter: fixed-size, stdlib-only Bloom filter over strings.
+- ScalableBloomFilter: grows by chaining larger BloomFilters, for crawls whose
+  size isn't known up front.
+- VisitedSet: drop-in for the crawler's `visited_urls` set (add / in / len) that
+  keeps memory flat on very large crawls. A false positive means one URL is
+  skipped as "already visited", which is benign for backlink discovery.
+- HopQueue: the BFS queue, bucketed by hop so levels are drained in order.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import OrderedDict, deque
+from typing import Iterator
+
+
+class BloomFilter:
+    """Bloom filter sized for `capacity` items at false-positive rate `error_rate`."""
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Standard sizing: m = -n ln(p) / ln(2)^2 bits, k = m/n ln(2) hashes.
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing (Kirsch–Mitzenmacher): two 64-bit halves of one digest.
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        """Number of add() calls (an upper bound on distinct items)."""
+        return self.count
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows as items are added (Almeida et al., 2007).
+
+    Starts with one BloomFilter of `initial_capacity`; when it is full a new
+    one, `growth` times larger and with a tighter error rate, is chained on.
+    The compounded false-positive rate stays below `error_rate`, and a small
+    crawl only pays for the first, small filter.
+    """
+
+    # Each new filter's error rate is the previous one's times this ratio, so
+    # the total is bounded by error_rate * first_rate / (1 - ratio).
+    TIGHTENING_RATIO = 0.9
+
+    def __init__(
+        self,
+        initial_capacity: int = 10_000,
+        error_rate: float = 1e-3,
+        growth: int = 2,
+    ) -> None:
+        if growth < 2:
+            raise ValueError("growth must be at least 2")
+        self.error_rate = error_rate
+        self.growth = growth
+        first_rate = error_rate * (1 - self.TIGHTENING_RATIO)
+        self._filters = [BloomFilter(initial_capacity, first_rate)]
+
+    def add(self, item: str) -> None:
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(
+                current.capacity * self.growth,
+                current.error_rate * self.TIGHTENING_RATIO,
+            )
+            self._filters.append(current)
+        current.add(item)
+
+    def __contains__(self, item: object) -> bool:
+        # Newest (largest) filter first: it holds most of the items.
+        return any(item in f for f in reversed(self._filters))
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self._filters)
+
+    @property
+    def capacity(self) -> int:
+        """Items the current chain holds before another filter is added."""
+        return sum(f.capacity for f in self._filters)
+
+
+class VisitedSet:
+    """
+    Membership-only stand-in for `set[str]`: a Bloom filter plus a small exact
+    LRU of recently added URLs. The LRU answers the common "just saw it" lookups
+    without hashing; everything older is answered by the Bloom filter.
+    Not iterable by design.
+
+    With `expected_urls` the filter is allocated at that size up front; without
+    it a ScalableBloomFilter starts small and grows with the crawl.
+    """
+
+    def __init__(
+        self,
+        expected_urls: int | None = None,
+        error_rate: float = 1e-3,
+        recent_size: int = 10_000,
+    ) -> None:
+        self._bloom: BloomFilter | ScalableBloomFilter
+        if expected_urls is None:
+            self._bloom = ScalableBloomFilter(error_rate=error_rate)
+        else:
+            self._bloom = BloomFilter(expected_urls, error_rate)
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._recent_size = recent_size
+        self._len = 0
+
+    def add(self, url: str) -> None:
+        if url in self:
+            return
+        self._bloom.add(url)
+        self._len += 1
+        self._recent[url] = None
+        if len(self._recent) > self._recent_size:
+            self._recent.popitem(last=False)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._recent or url in self._bloom
+
+    def __len__(self) -> int:
+        """Distinct URLs added (approximate: false positives are not counted)."""
+        return self._len
+
+
+class HopQueue:
+    """
+    BFS frontier of (url, hops) pairs, bucketed by hop count.
+
+    Same append/popleft/len API as the deque it replaces, but popleft always
+    returns the lowest pending hop (FIFO within a hop). URLs discovered at hop
+    N+1 by a fast page can no longer jump ahead of hop-N URLs still waiting, so
+    each BFS level is drained before the next one starts.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: dict[int, deque[str]] = {}
+        self._len = 0
+
+    def append(self, item: tuple[str, int]) -> None:
+        url, hops = item
+        bucket = self._buckets.get(hops)
+        if bucket is None:
+            bucket = self._buckets[hops] = deque()
+        bucket.append(url)
+        self._len += 1
+
+    def popleft(self) -> tuple[str, int]:
+        if not self._len:
+            raise IndexError("pop from an empty HopQueue")
+        hops = min(self._buckets)  # at most max_hops + 1 keys
+        bucket = self._buckets[hops]
+        url = bucket.popleft()
+        if not bucket:
+            del self._buckets[hops]
+        self._len -= 1
+        return url, hops
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        for hops in sorted(self._buckets):
+            for url in self._buckets[hops]:
+                yield url, hops
@@ -2,143 +2,302 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
 import logging  # Added logging
-import os
-from dataclasses import dataclass
-from typing import Iterable, List, Literal
-from urllib.parse import urljoin, urlparse
+import re
+from dataclasses import dataclass, field
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, List, Literal, Union
+from urllib.parse import urljoin, urlparse, urlsplit
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer, Tag
+
+from naive_backlink.frontier import VisitedSet
+from naive_backlink.models import (
+    _SLOTS,
+    BACKLINK,
+    CANDIDATE_PAGE,
+    INDIRECT,
+    ORIGIN_PAGE,
+    REL_ME,
+    STRONG,
+    WEAK,
+    EvidenceRecord,
+    LinkDetails,
+    URLContext,
+)
 
-import tldextract  # optional dependency
-from bs4 import BeautifulSoup, Tag
+log = logging.getLogger(__name__)  # Added logger
 
-from naive_backlink.models import EvidenceRecord, LinkDetails, URLContext
+# lxml's C parser is several times faster than the pure-Python "html.parser";
+# fall back to the latter so a broken/missing lxml install never stops a crawl.
+try:
+    import lxml  # noqa: F401  # nosec
 
-log = logging.getLogger(__name__)  # Added logger
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
 SameDomainPolicy = Literal["follow", "no-self-domain", "no-self-domain-or-subdomain"]
 
 # Add near top
-EXTENSION_DENYLIST = {
-    # images
-    ".png",
-    ".jpg",
-    ".jpeg",
-    ".gif",
-    ".webp",
-    ".bmp",
-    ".ico",
-    ".svg",
-    ".avif",
-    # video/audio
-    ".mp4",
-    ".m4v",
-    ".mov",
-    ".webm",
-    ".ogg",
-    ".ogv",
-    ".mp3",
-    ".wav",
-    ".flac",
-    ".aac",
-    # docs/binaries/archives
-    ".pdf",
-    ".zip",
-    ".tar",
-    ".gz",
-    ".tgz",
-    ".bz2",
-    ".xz",
-    ".7z",
-    ".rar",
-    ".exe",
-    ".msi",
-    ".dmg",
-    ".iso",
-    ".woff",
-    ".woff2",
-    ".ttf",
-    ".otf",
-    ".doc",
-    ".docx",
-    ".xls",
-    ".xlsx",
-    ".ppt",
-    ".pptx",
-    # styles/scripts (rarely identity pages)
-    ".css",
-    ".js",
-    ".mjs",
-    ".map",
-}
+EXTENSION_DENYLIST = frozenset(
+    {
+        # images
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".webp",
+        ".bmp",
+        ".ico",
+        ".svg",
+        ".avif",
+        # video/audio
+        ".mp4",
+        ".m4v",
+        ".mov",
+        ".webm",
+        ".ogg",
+        ".ogv",
+        ".mp3",
+        ".wav",
+        ".flac",
+        ".aac",
+        # docs/binaries/archives
+        ".pdf",
+        ".zip",
+        ".tar",
+        ".gz",
+        ".tgz",
+        ".bz2",
+        ".xz",
+        ".7z",
+        ".rar",
+        ".exe",
+        ".msi",
+        ".dmg",
+        ".iso",
+        ".woff",
+        ".woff2",
+        ".ttf",
+        ".otf",
+        ".doc",
+        ".docx",
+        ".xls",
+        ".xlsx",
+        ".ppt",
+        ".pptx",
+        # styles/scripts (rarely identity pages)
+        ".css",
+        ".js",
+        ".mjs",
+        ".map",
+    }
+)
 
 # rel values that indicate assets, not pages
-NON_HTML_REL = {
-    "icon",
-    "shortcut icon",
-    "apple-touch-icon",
-    "mask-icon",
-    "manifest",
-    "preload",
-    "prefetch",
-    "dns-prefetch",
-    "modulepreload",
-    "stylesheet",  # we don't crawl CSS
-}
+NON_HTML_REL = frozenset(
+    {
+        "icon",
+        "shortcut icon",
+        "apple-touch-icon",
+        "mask-icon",
+        "manifest",
+        "preload",
+        "prefetch",
+        "dns-prefetch",
+        "modulepreload",
+        "stylesheet",  # we don't crawl CSS
+    }
+)
 
 
-ALLOWED_SCHEMES = {"http", "https"}
+ALLOWED_SCHEMES = frozenset({"http", "https"})
 
 
-def _path_ext(u: str) -> str:
+# parse_url() is a pure function of its string argument and sees the same URLs
+# over and over (queueing, filtering, dedup, backlink checks), so it is memoized.
+# The size bounds memory on very long crawls.
+_URL_CACHE_SIZE = 131072
+
+
+@dataclass(frozen=True)
+class ParsedURL:
+    """
+    Everything the filters need from a URL, computed by a single urlparse().
+    Build with parse_url(); all fields describe the normalized URL.
+    """
+
+    normalized: str
+    scheme: str  # lowercased
+    netloc: str  # lowercased
+    path: str  # trailing "/" trimmed, case preserved
+    hostpath: str  # "host" or "host/path", lowercased, for pattern matching
+    ext: str  # lowercased extension of the last path segment, "" if none
+
+
+def _path_ext(path: str) -> str:
+    # query/fragment are already split off. Like os.path.splitext: the last "."
+    # of the last segment, and a leading dot (".well-known") is not an extension.
+    dot = path.rfind(".")
+    if dot <= path.rfind("/") + 1:
+        return ""
+    return path[dot:].lower()
+
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+# Analytics/click-tracking query params: same page, different URL.
+_TRACKING_PARAM_RE = re.compile(r"^(?:utm_|mc_)|^(?:fbclid|gclid|dclid|msclkid)$")
+_PCT_ESCAPE_RE = re.compile(r"%([0-9A-Fa-f]{2})")
+# RFC 3986 "unreserved" characters: percent-encoding them changes nothing.
+_UNRESERVED = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~"
+)
+
+
+def _pct_sub(m: re.Match[str]) -> str:
+    ch = chr(int(m.group(1), 16))
+    return ch if ch in _UNRESERVED else "%" + m.group(1).upper()
+
+
+def _normalize_escapes(s: str) -> str:
+    """Decode escaped unreserved characters; uppercase the hex of the rest."""
+    return _PCT_ESCAPE_RE.sub(_pct_sub, s) if "%" in s else s
+
+
+def _canonical_netloc(scheme: str, netloc: str) -> str:
+    """Drop the scheme's default port and IDNA-encode a non-ASCII host."""
+    userinfo, at, hostport = netloc.rpartition("@")
+    if hostport.startswith("["):  # IPv6 literal
+        end = hostport.find("]") + 1
+        host, port = hostport[:end], hostport[end + 1 :]
+    else:
+        host, _, port = hostport.partition(":")
+    if port == _DEFAULT_PORTS.get(scheme):
+        port = ""
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass  # not a valid IDN; keep it as written
+    return f"{userinfo}{at}{host}:{port}" if port else f"{userinfo}{at}{host}"
+
+
+def _canonical_query(query: str) -> str:
+    """Sort `k=v` pairs and drop tracking params. Pairs are kept as written."""
+    pairs = [
+        _normalize_escapes(pair)
+        for pair in query.split("&")
+        if pair and not _TRACKING_PARAM_RE.match(pair.partition("=")[0])
+    ]
+    pairs.sort()
+    return "&".join(pairs)
+
+
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
+def parse_url(url: str) -> ParsedURL:
+    """
+    Parse and normalize `url` once (see normalize_url for the rules).
+    Robust to malformed URLs: on failure, `normalized` is the input and the other
+    fields are empty, so every predicate treats it as unfetchable.
+    """
     try:
-        p = urlparse(u)
-        # strip query/fragment; use os.path splitext on the path
-        _, ext = os.path.splitext(p.path.lower())
-        return ext
+        p = urlparse(url)
+        # Normalize path:
+        # - if root "/", make it empty
+        # - else strip a single trailing "/" (but leave "/" inside the path)
+        if p.path == "/":
+            path = ""
+        elif p.path.endswith("/") and len(p.path) > 1:
+            path = p.path[:-1]
+        else:
+            path = p.path
+        scheme = (p.scheme or "").lower()
+        netloc = (p.netloc or "").lower()
+        if netloc:
+            netloc = _canonical_netloc(scheme, netloc)
+        path = _normalize_escapes(path)
+        normalized = p._replace(
+            scheme=scheme,
+            netloc=netloc,
+            path=path,
+            query=_canonical_query(p.query) if p.query else "",
+            fragment="",
+        ).geturl()
     except Exception:
-        return ""
+        return ParsedURL(url, "", "", "", "", "")
+
+    trimmed = path.lstrip("/").lower()
+    # "host" alone if no path
+    return ParsedURL(
+        normalized=normalized,
+        scheme=scheme,
+        netloc=netloc,
+        path=path,
+        hostpath=f"{netloc}/{trimmed}" if trimmed else netloc,
+        ext=_path_ext(path),
+    )
+
 
+def _parsed(u: str | ParsedURL) -> ParsedURL:
+    return u if isinstance(u, ParsedURL) else parse_url(u)
 
-def is_probably_html_url(u: str) -> bool:
+
+def is_probably_html_url(u: str | ParsedURL) -> bool:
     """
     Heuristic: http/https AND path extension NOT in a denylist.
     Allows extensionless paths and 'clean URLs'. Blocks obvious assets (png, ico, etc.).
     """
-    if not is_fetchable_url(u):
+    pu = _parsed(u)
+    if not is_fetchable_url(pu):
         return False
-    ext = _path_ext(u)
-    if ext and ext in EXTENSION_DENYLIST:
+    if pu.ext and pu.ext in EXTENSION_DENYLIST:
         return False
     return True
 
 
-def _rel_list(tag: Tag) -> List[str]:
+def _rel_list(tag: LinkElement) -> List[str]:
+    if isinstance(tag, HrefElement):
+        return list(tag.rel)  # canonicalized once, in extract_links()
     rel = tag.get("rel", None)
     if not rel:
         return []
     if isinstance(rel, str):
-        string_rel = rel.split()
-        [r.strip().lower() for r in string_rel if isinstance(r, str)]
+        # bs4 splits rel into a list; a plain string only comes from odd builders
+        rel = rel.split()
 
     return [r.strip().lower() for r in rel if isinstance(r, str)]
 
 
-def _is_asset_rel(tag: Tag) -> bool:
-    rels = set(_rel_list(tag))
+def _is_asset_rel(tag: LinkElement) -> bool:
     # treat any intersection as asset-ish
-    return any(r in NON_HTML_REL for r in rels)
+    return not NON_HTML_REL.isdisjoint(_rel_list(tag))
 
 
-def _scheme(u: str) -> str:
-    try:
-        return urlparse(u).scheme.lower()
-    except Exception:
-        return ""
+def is_fetchable_url(u: str | ParsedURL) -> bool:
+    """Return True iff URL uses a scheme we can actually fetch (http/https)."""
+    return _parsed(u).scheme in ALLOWED_SCHEMES
 
 
-def is_fetchable_url(u: str) -> bool:
-    """Return True iff URL uses a scheme we can actually fetch (http/https)."""
-    return _scheme(u) in ALLOWED_SCHEMES
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+@dataclass(frozen=True, **_SLOTS)
+class CompiledPatterns:
+    """
+    A blacklist/whitelist split by how cheaply each pattern can be matched:
+
+    - literals: no glob characters, so fnmatchcase() is plain equality.
+    - prefixes: "<literal>/*", which matches exactly the forms starting with
+      "<literal>/"; kept with the trailing "/" for a set lookup.
+    - regex: one alternation of everything else (fnmatch.translate), or None.
+    - suffixes: the domains of leading-'*.' subdomain rules.
+    """
+
+    literals: frozenset[str] = frozenset()
+    prefixes: frozenset[str] = frozenset()
+    regex: re.Pattern[str] | None = None
+    suffixes: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -156,22 +315,59 @@ class LogicConfig:
     whitelist_patterns: List[str] | None = None
     # Modes
     only_whitelist: bool = False
+    # Derived in __post_init__: normalized trusted domains for label lookups.
+    _trusted_domains: frozenset[str] = field(
+        init=False, repr=False, compare=False, default=frozenset()
+    )
+    # Derived in __post_init__: _compile_patterns() of each list, so the
+    # per-URL checks never convert or hash the pattern lists again.
+    _blacklist_compiled: CompiledPatterns = field(
+        init=False, repr=False, compare=False, default=CompiledPatterns()
+    )
+    _whitelist_compiled: CompiledPatterns = field(
+        init=False, repr=False, compare=False, default=CompiledPatterns()
+    )
 
-
-def _host_and_hostpath(u: str) -> tuple[str, str]:
+    def __post_init__(self) -> None:
+        # "*.example.com", ".example.com" and "example.com" all mean the same.
+        domains = frozenset(
+            d.strip().lower().lstrip("*").lstrip(".")
+            for d in (self.trusted_domains or [])
+        )
+        object.__setattr__(self, "_trusted_domains", domains - {""})
+        object.__setattr__(
+            self,
+            "_blacklist_compiled",
+            _compile_patterns(tuple(self.blacklist_patterns or ())),
+        )
+        object.__setattr__(
+            self,
+            "_whitelist_compiled",
+            _compile_patterns(tuple(self.whitelist_patterns or ())),
+        )
+
+    def is_trusted_host(self, host: str) -> bool:
+        """
+        True iff `host` (port ignored) is a trusted domain or a subdomain of one.
+        Matches whole labels: "example.com" trusts "a.example.com" but not
+        "notexample.com". One set lookup per label of the host.
+        """
+        if not self._trusted_domains:
+            return False
+        labels = host.rpartition("@")[2].partition(":")[0].lower().split(".")
+        return any(
+            ".".join(labels[i:]) in self._trusted_domains for i in range(len(labels))
+        )
+
+
+def _host_and_hostpath(u: str | ParsedURL) -> tuple[str, str]:
     """
     Returns (host, host+path) both lowercased and normalized:
       ("github.com", "github.com/sponsors?page=2" -> "github.com/sponsors")
     Query/fragment are ignored for matching.
     """
-    try:
-        p = urlparse(normalize_url(u))
-        host = (p.netloc or "").lower()
-        path = (p.path or "").lstrip("/").lower()
-        hostpath = f"{host}/{path}" if path else host  # "host" alone if no path
-        return host, hostpath
-    except Exception:
-        return "", ""
+    pu = _parsed(u)
+    return pu.netloc, pu.hostpath
 
 
 # def is_blacklisted(u: str, cfg: LogicConfig) -> bool:
@@ -226,49 +422,105 @@ def _host_and_hostpath(u: str) -> tuple[str, str]:
 #     return False
 
 
-def _match_url_against_patterns(u: str, patterns: list[str]) -> bool:
-    """Generic fnmatch helper used by is_blacklisted and is_whitelisted."""
+@functools.lru_cache(maxsize=64)
+def _compile_patterns(patterns: tuple[str, ...]) -> CompiledPatterns:
+    """
+    Compile a pattern list once. Equivalent to fnmatchcase() against each
+    pattern in turn, but literal and "<literal>/*" patterns (most of a typical
+    blacklist) become set lookups, so their cost does not grow with the list;
+    the remaining globs share one regex pass per candidate form.
+    """
+    literals: set[str] = set()
+    prefixes: set[str] = set()
+    globs: list[str] = []
+    for pat in patterns:
+        p = pat.lower().strip()
+        if not _GLOB_CHARS.search(p):
+            literals.add(p)
+        elif p.endswith("/*") and not _GLOB_CHARS.search(p[:-2]):
+            prefixes.add(p[:-1])
+        else:
+            globs.append(p)
+    regex = (
+        re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in globs))
+        if globs
+        else None
+    )
+    # handle leading '*.' wildcard for subdomain rules like '*.example.com/*'
+    suffixes = tuple(
+        p[2:].replace("/*", "").rstrip("/") for p in globs if p.startswith("*.")
+    )
+    return CompiledPatterns(frozenset(literals), frozenset(prefixes), regex, suffixes)
+
+
+_NO_PATTERNS = _compile_patterns(())
+
+
+def _match_url_against_patterns(u: str | ParsedURL, patterns: list[str]) -> bool:
+    """Generic fnmatch helper: does `u` match any of `patterns`?"""
     if not patterns:
         return False
+    return _match_compiled(u, _compile_patterns(tuple(patterns)))
+
+
+def _match_compiled(u: str | ParsedURL, compiled: CompiledPatterns) -> bool:
+    """Match `u` against a _compile_patterns() result (see LogicConfig)."""
+    if compiled is _NO_PATTERNS:
+        return False
 
     host, hostpath = _host_and_hostpath(u)
     if not host:
         return False  # Can't match on an empty host
 
     # Build candidate forms to test against
-    candidates = {
+    candidates = (
         host,
         f"{host}/",
         f"{host}/*",
         hostpath,
         f"{hostpath}/",
         f"{hostpath}/*",
-    }
-
-    for pat in patterns:
-        p = pat.lower().strip()
-        # direct fnmatch against all candidates
-        if any(fnmatch.fnmatchcase(c, p) for c in candidates):
-            return True
-
-        # handle leading '*.' wildcard for subdomain rules like '*.example.com/*'
-        if p.startswith("*."):
-            suffix = p[2:].replace("/*", "").rstrip("/")
-            # require that host is a subdomain of suffix, not equal to it
-            if host.endswith(suffix) and host != suffix:
+    )
+    if compiled.literals and not compiled.literals.isdisjoint(candidates):
+        return True
+
+    if compiled.prefixes:
+        # Every form is a prefix of hostpath + "/" (or adds only a trailing "*"),
+        # so its "/"-terminated prefixes cover all six forms.
+        full = candidates[4]
+        prefixes = compiled.prefixes
+        i = full.find("/")
+        while i != -1:
+            if full[: i + 1] in prefixes:
                 return True
+            i = full.find("/", i + 1)
+
+    regex = compiled.regex
+    if regex is not None and any(regex.match(c) for c in candidates):
+        return True
+
+    # require that host is a subdomain of suffix, not equal to it
+    return any(host.endswith(sfx) and host != sfx for sfx in compiled.suffixes)
 
-    return False
 
+def is_blacklisted(u: str | ParsedURL, cfg: LogicConfig) -> bool:
+    """Uses the generic matcher against the (precompiled) blacklist."""
+    return _match_compiled(u, cfg._blacklist_compiled)
 
-def is_blacklisted(u: str, cfg: LogicConfig) -> bool:
-    """Uses the generic matcher against the blacklist."""
-    return _match_url_against_patterns(u, cfg.blacklist_patterns or [])
 
+def is_whitelisted(u: str | ParsedURL, cfg: LogicConfig) -> bool:
+    """Uses the generic matcher against the (precompiled) whitelist."""
+    return _match_compiled(u, cfg._whitelist_compiled)
 
-def is_whitelisted(u: str, cfg: LogicConfig) -> bool:
-    """Uses the generic matcher against the whitelist."""
-    return _match_url_against_patterns(u, cfg.whitelist_patterns or [])
+
+def is_crawlable_url(u: str | ParsedURL, cfg: LogicConfig) -> bool:
+    """
+    Enqueue-time gate shared by both crawlers: http/https, probably HTML, and not
+    blacklisted. Checked before a URL enters the BFS queue, so rejected URLs never
+    take up queue space or get popped just to be thrown away.
+    """
+    pu = _parsed(u)
+    return is_probably_html_url(pu) and not is_blacklisted(pu, cfg)
 
 
 # ---------- URL helpers ----------
@@ -278,40 +530,65 @@ def normalize_url(url: str) -> str:
     """
     Normalize scheme/netloc to lowercase, drop fragment, and trim trailing slash.
     - Trim trailing "/" for *any* path, including root ("/").
+    - Drop default ports (:80 for http, :443 for https); IDNA-encode the host.
+    - Decode percent-escaped unreserved characters ("%7E" -> "~").
+    - Sort query params and drop tracking ones (utm_*, mc_*, fbclid, gclid, ...),
+      so reordered or tagged copies of a page collapse to one URL.
     - Robust to malformed URLs (returns input on failure).
+
+    Memoized through parse_url(); _netloc() and the predicates share that cache.
     """
-    try:
-        p = urlparse(url)
-        # Normalize path:
-        # - if root "/", make it empty
-        # - else strip a single trailing "/" (but leave "/" inside the path)
-        if p.path == "/":
-            path = ""
-        elif p.path.endswith("/") and len(p.path) > 1:
-            path = p.path[:-1]
-        else:
-            path = p.path
+    return parse_url(url).normalized
 
-        return p._replace(
-            scheme=(p.scheme or "").lower(),
-            netloc=(p.netloc or "").lower(),
-            path=path,
-            fragment="",
-        ).geturl()
-    except Exception:
-        return url
+
+def clear_url_caches() -> None:
+    """
+    Empty the memoized URL helpers (parse_url and friends). They are bounded, so
+    this is only needed to release memory in a long-lived process between
+    unrelated crawls, or to make cache statistics deterministic in tests.
+    """
+    parse_url.cache_clear()
+    _base_prefix.cache_clear()
+    _registrable_domain_or.cache_clear()
+    origin_info.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _base_prefix(base: str) -> str | None:
+    """'scheme://netloc' of a page URL, or None if it has no host."""
+    parts = urlsplit(base)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme and parts.netloc else None
 
 
-def _netloc(host_url: str) -> str:
-    return urlparse(host_url).netloc.lower()
+def _resolve_href(base: str, href: str) -> str:
+    """
+    urljoin(base, href), with a fast path for plain root-relative hrefs ("/about").
+    Those are most links on a page and resolve by concatenation; anything with
+    dot segments, "//host" or characters urlsplit would strip goes to urljoin.
+    """
+    if href[:1] == "/" and href[1:2] != "/" and "/." not in href and href.isprintable():
+        prefix = _base_prefix(base)
+        if prefix is not None:
+            return prefix + href
+    return urljoin(base, href)
+
 
+def _netloc(host_url: str | ParsedURL) -> str:
+    return _parsed(host_url).netloc
 
+
+@functools.lru_cache(maxsize=16384)
 def _registrable_domain_or(host: str, fallback_to_host: bool = True) -> str:
     """
     Returns eTLD+1 if tldextract is available and host looks valid.
     Falls back to host (minus a leading 'www.') if not.
+    Memoized: a Public Suffix List lookup per call adds up, and hosts recur.
     """
     try:
+        # Imported on use (tens of ms at startup) and only by the registrable-domain
+        # policy; an ImportError falls through to the host fallback below.
+        import tldextract
+
         ext = tldextract.extract(host)
         if ext.domain and ext.suffix:
             return f"{ext.domain}.{ext.suffix}".lower()
@@ -322,15 +599,45 @@ def _registrable_domain_or(host: str, fallback_to_host: bool = True) -> str:
     return host
 
 
-def _is_same_domain_blocked(candidate: str, origin: str, cfg: LogicConfig) -> bool:
+@dataclass(frozen=True)
+class OriginInfo:
+    """
+    Origin-side tokens for the same-domain policy, derived once per origin
+    (see origin_info) instead of once per candidate link.
+    """
+
+    url: str  # normalized
+    host: str
+    subdomain_suffix: str  # "." + host
+
+    @functools.cached_property
+    def registrable_root(self) -> str:
+        # Lazy: only the registrable-domain policy needs the tldextract lookup.
+        return _registrable_domain_or(self.host)
+
+
+@functools.lru_cache(maxsize=64)
+def origin_info(origin_url: str) -> OriginInfo:
+    pu = parse_url(origin_url)
+    return OriginInfo(
+        url=pu.normalized, host=pu.netloc, subdomain_suffix="." + pu.netloc
+    )
+
+
+def _is_same_domain_blocked(
+    candidate: str, origin: str | OriginInfo, cfg: LogicConfig
+) -> bool:
     """
     Decide whether to block candidate based on same-domain policy.
+    `origin` is the origin host, or an OriginInfo to skip re-deriving its parts.
     """
     if cfg.same_domain_policy == "follow":
         return False
 
     cand = candidate
-    orig = origin
+    if isinstance(origin, str):
+        origin = OriginInfo(url="", host=origin, subdomain_suffix="." + origin)
+    orig = origin.host
 
     if cfg.same_domain_policy == "no-self-domain":
         return cand == orig
@@ -338,50 +645,184 @@ def _is_same_domain_blocked(candidate: str, origin: str, cfg: LogicConfig) -> bo
     # "no-self-domain-or-subdomain"
     if cfg.use_registrable_domain:
         c_root = _registrable_domain_or(cand)
-        o_root = _registrable_domain_or(orig)
+        o_root = origin.registrable_root
         # block if registrable roots match
         return c_root == o_root
     else:
         # naive: block exact host or any child subdomain of origin host
-        return cand == orig or cand.endswith("." + orig)
+        return cand == orig or cand.endswith(origin.subdomain_suffix)
 
 
 # ---------- Link extraction & filtering ----------
 
 
+# Everything downstream only reads href/rel/str(tag) of <a> and <link>; skip
+# building the rest of the tree (head, scripts, styles, text nodes) entirely.
+LINK_STRAINER = SoupStrainer(["a", "link"], href=True)
+
+
+def parse_html(markup: str | bytes) -> BeautifulSoup:
+    """
+    Parse a fetched page with the fastest available parser (see HTML_PARSER),
+    keeping only <a href> and <link href> elements (see LINK_STRAINER).
+    Pass bytes when you have them, so the parser honors the page's own
+    encoding declaration instead of relying on an upstream decode.
+    """
+    try:
+        return BeautifulSoup(markup, HTML_PARSER, parse_only=LINK_STRAINER)
+    except FeatureNotFound:
+        # lxml imports but bs4 can't use it (e.g. mismatched builds)
+        return BeautifulSoup(markup, "html.parser", parse_only=LINK_STRAINER)
+
+
+def iter_href_elements(soup: BeautifulSoup) -> Iterator[Tag]:
+    """
+    Lazily yield every <a href> and then every <link href>, in one walk of the
+    tree: <a> tags are yielded as they are reached, <link> tags (a few, in
+    <head>) are held back until the walk ends. Consumers that stop early (a
+    backlink found, max_outlinks reached) never walk the rest of the tree.
+    """
+    links: List[Tag] = []
+    for el in soup.descendants:
+        if isinstance(el, Tag) and el.has_attr("href"):
+            if el.name == "a":
+                yield el
+            elif el.name == "link":
+                links.append(el)
+    yield from links
+
+
 def extract_href_elements(soup: BeautifulSoup) -> List[Tag]:
     """
     Return all elements with href among the set {<a>, <link>}.
     This supports Mastodon and other sites that expose identity via <link>.
     """
-    anchors = soup.find_all("a", href=True)
-    links = soup.find_all("link", href=True)
-    # Maintain document order as best-effort by concatenation; strict order
-    # isn’t required for correctness (we only need presence).
-    return list(anchors) + list(links)
+    # <a> before <link>, as before; strict document order isn’t required for
+    # correctness (we only need presence).
+    return list(iter_href_elements(soup))
+
+
+@dataclass(frozen=True, **_SLOTS)
+class HrefElement:
+    """
+    Plain-data copy of an <a>/<link> tag: the three things the crawl reads.
+
+    Built in the parse thread so the BeautifulSoup tree never crosses back to
+    the event loop and can be freed as soon as parsing is done. get() and str()
+    mirror Tag, so every link_logic helper accepts either.
+    """
+
+    name: str
+    href: str
+    rel: tuple[str, ...]
+    html: str
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "href":
+            return self.href
+        if key == "rel":
+            return list(self.rel) if self.rel else default
+        return default
+
+    def __str__(self) -> str:
+        return self.html
+
+
+LinkElement = Union[Tag, HrefElement]
+
+
+def extract_links(soup: BeautifulSoup) -> List[HrefElement]:
+    """extract_href_elements(), copied out of the tree as HrefElements."""
+    return [
+        HrefElement(el.name, el["href"], tuple(_rel_list(el)), str(el))  # type: ignore[arg-type]
+        for el in iter_href_elements(soup)
+    ]
+
+
+def parse_links(markup: str | bytes) -> List[HrefElement]:
+    """
+    parse_html() + extract_links() in one call: the crawlers run this in a worker
+    thread and only get plain data back.
+    """
+    return extract_links(parse_html(markup))
+
+
+def _as_set(items: Iterable[str] | VisitedSet) -> AbstractSet[str] | VisitedSet:
+    """Use a caller's set as-is (O(1) lookups, no copy); materialize anything else."""
+    if isinstance(items, (AbstractSet, VisitedSet)):
+        return items
+    return set(items)
+
+
+def _candidate_from_href(
+    current_url: str,
+    href: str,
+    cfg: LogicConfig,
+    known: tuple[AbstractSet[str] | VisitedSet | Dict[str, None], ...],
+) -> ParsedURL | None:
+    """
+    Resolve `href` against the page and apply the filters shared by both hops:
+    already known (any of `known`), http/https, whitelist/blacklist, likely HTML.
+    Returns the parsed candidate, or None if it is dropped. The single parse is
+    returned so the caller's own policy checks reuse it.
+    """
+    pu = parse_url(_resolve_href(current_url, href))
+    norm = pu.normalized
+
+    # Cheapest check first: a handful of hash lookups before any pattern work.
+    for seen in known:
+        if norm in seen:
+            return None
+
+    # only follow http/https
+    if not is_fetchable_url(pu):
+        return None
+
+    # --- NEW: Whitelist Mode Check ---
+    if cfg.only_whitelist and not is_whitelisted(pu, cfg):
+        log.debug("[Whitelist Mode] Skipping non-whitelisted URL: %s", norm)
+        return None
+
+    # --- Blacklist Mode Check (default) ---
+    if not cfg.only_whitelist and is_blacklisted(pu, cfg):
+        log.debug("[Blacklist Mode] Skipping blacklisted URL: %s", norm)
+        return None
+
+    # Only follow likely-HTML targets (blocks .png/.ico/.svg/... before GET)
+    if not is_probably_html_url(pu):
+        return None
+    return pu
 
 
 def queue_candidates_from_origin(
     current_url: str,
     origin_url: str,
-    elements: Iterable[Tag],
+    elements: Iterable[LinkElement],
     cfg: LogicConfig,
     already_queued: Iterable[str],
-    visited: Iterable[str],
+    visited: Iterable[str] | VisitedSet,
 ) -> List[str]:
     """
     From the origin page, choose outbound candidate URLs to crawl next hop.
     Considers both <a href> and <link href>.
 
     Applies blacklist and (if enabled) whitelist logic.
+
+    `already_queued` and `visited` are only used for membership tests; pass sets
+    (the crawlers do) so they are used directly instead of copied per call.
     """
-    out: List[str] = []
+    # dict as an ordered set: O(1) "already picked" checks, insertion order kept
+    out: Dict[str, None] = {}
     # origin_domain = urlparse(origin_url).netloc
 
-    queued_set = set(already_queued)
-    visited_set = set(visited)
+    queued_set = _as_set(already_queued)
+    visited_set = _as_set(visited)
 
-    origin_host = _netloc(origin_url)
+    origin = origin_info(origin_url)
+    # Menus and footers repeat the same href many times; a raw-string hash skips
+    # the repeats before any urljoin/parse/pattern work.
+    seen_href: set[str] = set()
+    known = (out, visited_set, queued_set)
 
     for el in elements:
         if len(out) >= cfg.max_outlinks:
@@ -393,50 +834,32 @@ def queue_candidates_from_origin(
         # Skip obvious non-HTML assets by rel
         if _is_asset_rel(el):
             continue
-
-        resolved = urljoin(current_url, href)  # type: ignore[arg-type,type-var]
-        norm = normalize_url(resolved)  # type: ignore[arg-type]
-
-        # only follow http/https
-        if not is_fetchable_url(norm):
-            continue
-
-        # --- NEW: Whitelist Mode Check ---
-        if cfg.only_whitelist and not is_whitelisted(norm, cfg):
-            log.debug("[Whitelist Mode] Skipping non-whitelisted URL: %s", norm)
-            continue
-
-        # --- Blacklist Mode Check (default) ---
-        if not cfg.only_whitelist and is_blacklisted(norm, cfg):
-            log.debug("[Blacklist Mode] Skipping blacklisted URL: %s", norm)
+        if href in seen_href:
             continue
+        seen_href.add(href)  # type: ignore[arg-type]
 
-        # Only follow likely-HTML targets (blocks .png/.ico/.svg/... before GET)
-        if not is_probably_html_url(resolved):  # type: ignore[arg-type]
+        # One parse per link; every check reads fields off `pu`.
+        pu = _candidate_from_href(current_url, href, cfg, known)  # type: ignore[arg-type]
+        if pu is None:
             continue
 
-        cand_host = _netloc(norm)
-
         # same-domain policy gate
-        if _is_same_domain_blocked(cand_host, origin_host, cfg):
+        if _is_same_domain_blocked(pu.netloc, origin, cfg):
             continue
 
-        if norm in visited_set or norm in queued_set or norm in out:
-            continue
-
-        out.append(norm)
+        out[pu.normalized] = None
 
-    return out
+    return list(out)
 
 
 def queue_candidates_from_pivot(
     current_url: str,
     pivot_url: str,
     origin_url: str,
-    elements: Iterable[Tag],
+    elements: Iterable[LinkElement],
     cfg: LogicConfig,
     already_queued: Iterable[str],
-    visited: Iterable[str],
+    visited: Iterable[str] | VisitedSet,
 ) -> List[str]:
     """
     Select pivot→neighbor candidates (B → C) from a non-origin page.
@@ -449,11 +872,14 @@ def queue_candidates_from_pivot(
         not the pivot (keeps exploration focused on distinct surfaces from A).
 
     Applies blacklist and (if enabled) whitelist logic.
+    `already_queued` / `visited`: pass sets to avoid a copy per call.
     """
-    out: List[str] = []
-    queued_set = set(already_queued)
-    visited_set = set(visited)
-    origin_host = _netloc(origin_url)
+    out: Dict[str, None] = {}  # ordered set
+    queued_set = _as_set(already_queued)
+    visited_set = _as_set(visited)
+    origin = origin_info(origin_url)
+    seen_href: set[str] = set()
+    known = (out, visited_set, queued_set)
 
     for el in elements:
         if len(out) >= cfg.max_outlinks:
@@ -463,26 +889,32 @@ def queue_candidates_from_pivot(
             continue
         if _is_asset_rel(el):
             continue
-        resolved = normalize_url(urljoin(current_url, href))  # type: ignore[arg-type,type-var]
-        if not is_fetchable_url(resolved):
+        if href in seen_href:
             continue
-
-        # --- NEW: Whitelist Mode Check ---
-        if cfg.only_whitelist and not is_whitelisted(resolved, cfg):
-            log.debug("[Whitelist Mode] Skipping non-whitelisted URL: %s", resolved)
-            continue
-
-        # --- Blacklist Mode Check (default) ---
-        if not cfg.only_whitelist and is_blacklisted(resolved, cfg):
-            log.debug("[Blacklist Mode] Skipping blacklisted URL: %s", resolved)
+        seen_href.add(href)  # type: ignore[arg-type]
+        pu = _candidate_from_href(current_url, href, cfg, known)  # type: ignore[arg-type]
+        if pu is None:
             continue
-        if not is_probably_html_url(resolved):
-            continue
-        if resolved == origin_url or _netloc(resolved) == origin_host:
+        resolved = pu.normalized
+        if resolved == origin.url or pu.netloc == origin.host:
             continue  # do not chase back into A here
-        if resolved in visited_set or resolved in queued_set or resolved in out:
-            continue
-        out.append(resolved)
+        out[resolved] = None
+    return list(out)
+
+
+def pivot_neighbors(parent: Dict[str, str]) -> Dict[str, set[str]]:
+    """
+    Invert a crawler's `parent` map (neighbor C -> pivot B) into B -> {C}.
+    `parent` keeps only the pivot that queued C first, so a neighbor linked
+    from several pivots is listed under that one alone.
+    """
+    out: Dict[str, set[str]] = {}
+    for neighbor, pivot in parent.items():
+        # get() first: setdefault() would build a throwaway set() per neighbor.
+        neighbors = out.get(pivot)
+        if neighbors is None:
+            neighbors = out[pivot] = set()
+        neighbors.add(neighbor)
     return out
 
 
@@ -492,43 +924,83 @@ def queue_candidates_from_pivot(
 def detect_backlink_element(
     current_url: str,
     origin_url: str,
-    elements: Iterable[Tag],
-) -> Tag | None:
+    elements: Iterable[LinkElement],
+) -> LinkElement | None:
     """
     Return the first tag (either <a> or <link>) on current_url that links back to origin_url.
+    To check several targets on the same page, build index_links() once instead.
     """
     norm_origin = normalize_url(origin_url)
     for el in elements:
         href = el.get("href")
         if not href:
             continue
-        resolved = normalize_url(urljoin(current_url, href))  # type: ignore[arg-type,type-var]
+        pu = parse_url(_resolve_href(current_url, href))  # type: ignore[arg-type]
 
         # ignore non-fetchable links (mailto:, tel:, javascript:, data:, etc.)
-        if not is_fetchable_url(resolved):
+        if not is_fetchable_url(pu):
             continue
 
-        if resolved == norm_origin:
+        if pu.normalized == norm_origin:
             return el
     return None
 
 
+def index_links(
+    current_url: str,
+    elements: Iterable[LinkElement],
+    wanted: AbstractSet[str] | None = None,
+) -> Dict[str, LinkElement]:
+    """
+    Map each fetchable link target on a page to the first tag pointing at it:
+    {normalized resolved URL: tag}.
+
+    Built once per page, so the B → A and C → B backlink checks are each a dict
+    lookup instead of another resolve-and-normalize pass over every element.
+    For a single one-off lookup, detect_backlink_element stops at the first hit.
+
+    With `wanted`, only those targets are indexed and the scan stops as soon as
+    all of them have been found.
+    """
+    index: Dict[str, LinkElement] = {}
+    seen_href: set[str] = set()
+    for el in elements:
+        href = el.get("href")
+        if not href or href in seen_href:
+            continue
+        seen_href.add(href)  # type: ignore[arg-type]
+        pu = parse_url(_resolve_href(current_url, href))  # type: ignore[arg-type]
+        norm = pu.normalized
+        if norm in index or (wanted is not None and norm not in wanted):
+            continue
+        # ignore non-fetchable links (mailto:, tel:, javascript:, data:, etc.)
+        if is_fetchable_url(pu):
+            index[norm] = el
+            if wanted is not None and len(index) == len(wanted):
+                break
+    return index
+
+
 def classify_backlink(
-    tag: Tag, source_url: str, cfg: LogicConfig
+    tag: LinkElement, source_url: str, cfg: LogicConfig
 ) -> tuple[str, str, bool]:
     """
     Returns (kind, classification, trusted_surface).
     - classification: 'strong' iff rel~="me" (works for both <a> and <link>)
     - kind: 'rel-me' when strong, otherwise 'backlink'
-    - trusted_surface: domain substring match against cfg.trusted_domains
+    - trusted_surface: source host is (a subdomain of) one of cfg.trusted_domains
     """
-    rel = _rel_list(tag)
+    return _classify(_rel_list(tag), source_url, cfg)
+
+
+def _classify(
+    rel: List[str], source_url: str, cfg: LogicConfig
+) -> tuple[str, str, bool]:
     is_strong = "me" in rel
-    kind = "rel-me" if is_strong else "backlink"
-    classification = "strong" if is_strong else "weak"
+    kind = REL_ME if is_strong else BACKLINK
+    classification = STRONG if is_strong else WEAK
 
-    source_domain = _netloc(source_url)
-    trusted_surface = any(d in source_domain for d in (cfg.trusted_domains or []))
+    trusted_surface = cfg.is_trusted_host(_netloc(source_url))
     return kind, classification, trusted_surface
 
 
@@ -536,17 +1008,17 @@ def make_evidence(
     source_url: str,
     origin_url: str,
     hops: int,
-    tag: Tag,
+    tag: LinkElement,
     cfg: LogicConfig,
     ordinal: int,
 ) -> EvidenceRecord:
-    kind, classification, trusted_surface = classify_backlink(tag, source_url, cfg)
-    rel_vals = _rel_list(tag)
+    rel_vals = _rel_list(tag)  # once, shared with the classification
+    kind, classification, trusted_surface = _classify(rel_vals, source_url, cfg)
     return EvidenceRecord(
         id=f"e-backlink-{ordinal}",
         kind=kind,  # type: ignore[arg-type]
-        source=URLContext(url=normalize_url(origin_url), context="origin-page"),
-        target=URLContext(url=normalize_url(source_url), context="candidate-page"),
+        source=URLContext(url=normalize_url(origin_url), context=ORIGIN_PAGE),
+        target=URLContext(url=normalize_url(source_url), context=CANDIDATE_PAGE),
         link=LinkDetails(
             html=str(tag),
             rel=rel_vals,
@@ -575,11 +1047,11 @@ def make_indirect_evidence(
     """
     return EvidenceRecord(
         id=f"e-indirect-{ordinal}",
-        kind="backlink",
-        source=URLContext(url=normalize_url(origin_url), context="origin-page"),
-        target=URLContext(url=normalize_url(neighbor_url), context="candidate-page"),
+        kind=BACKLINK,
+        source=URLContext(url=normalize_url(origin_url), context=ORIGIN_PAGE),
+        target=URLContext(url=normalize_url(neighbor_url), context=CANDIDATE_PAGE),
         link=None,
-        classification="indirect",
+        classification=INDIRECT,
         hops=hops,
         trusted_surface=False,
         notes=f"INDIRECT via pivot={normalize_url(pivot_url)} chain={normalize_url(origin_url)}<->{normalize_url(pivot_url)}<->{normalize_url(neighbor_url)}",
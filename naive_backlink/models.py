@@ -3,8 +3,9 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Literal
+from typing import Literal, cast
 
 # Type definitions for clarity, matching the PEP specification.
 Classification = Literal["strong", "weak", "indirect"]
@@ -14,8 +15,23 @@ Kind = Literal[
 Context = Literal["origin-page", "candidate-page"]
 ScoreLabel = Literal["high", "medium", "low"]
 
+# The vocabulary above as shared constants. Interned, so every record refers to
+# one string object and == short-circuits on identity (hyphenated literals such
+# as "candidate-page" are not interned by the compiler).
+STRONG = cast(Classification, sys.intern("strong"))
+WEAK = cast(Classification, sys.intern("weak"))
+INDIRECT = cast(Classification, sys.intern("indirect"))
+BACKLINK = cast(Kind, sys.intern("backlink"))
+REL_ME = cast(Kind, sys.intern("rel-me"))
+ORIGIN_PAGE = cast(Context, sys.intern("origin-page"))
+CANDIDATE_PAGE = cast(Context, sys.intern("candidate-page"))
 
-@dataclass
+# A crawl can produce thousands of evidence records; __slots__ drops the
+# per-instance __dict__. dataclass(slots=...) needs Python 3.10+.
+_SLOTS: dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class URLContext:
     """Represents a URL within a specific context."""
 
@@ -23,7 +39,7 @@ class URLContext:
     context: Context
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class LinkDetails:
     """Contains details about the HTML link element."""
 
@@ -32,7 +48,7 @@ class LinkDetails:
     nofollow: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class EvidenceRecord:
     """
     A structured record of a piece of evidence found during the crawl.
@@ -51,7 +67,7 @@ class EvidenceRecord:
     notes: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Result:
     """The final result of a crawl_and_score operation."""
 
@@ -3,7 +3,8 @@
 Playwright-based crawler.
 
 Goals:
-- Stay faithful to original behavior (render JS, single tab, BFS, hop limits).
+- Stay faithful to original behavior (render JS, BFS, hop limits), with a small
+  pool of tabs (playwright_concurrency) working the queue concurrently.
 - Centralize all tag/URL logic via link_logic.py.
 - Support both <a href=...> and <link href=...> for outlinks/backlinks.
 - Preserve and clarify logging.
@@ -21,29 +22,32 @@ Config keys consumed:
   - only_rel_me: bool
   - whitelist: list[str]
   - blacklist: list[str]
+  - playwright_concurrency: int (pages fetched in parallel; default 4)
+  - quick_nav: bool (parse after first byte + short grace, not DOMContentLoaded)
   ...
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Deque, Dict, List, Set
+from typing import Any, Dict, List, Set
 
-from bs4 import BeautifulSoup
-from playwright.async_api import Browser, Page, Playwright, async_playwright
+from playwright.async_api import BrowserContext, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
+from naive_backlink.browser_pool import get_browser, release_browser
 from naive_backlink.link_logic import _rel_list  # Import for rel="me" check
 from naive_backlink.link_logic import (
+    HrefElement,
     LogicConfig,
-    detect_backlink_element,
-    extract_href_elements,
-    is_blacklisted,
-    is_fetchable_url,
-    is_probably_html_url,
+    index_links,
+    is_crawlable_url,
     make_evidence,
     make_indirect_evidence,
     normalize_url,
+    parse_links,
+    pivot_neighbors,
     queue_candidates_from_origin,
     queue_candidates_from_pivot,
 )
@@ -51,6 +55,20 @@ from naive_backlink.models import EvidenceRecord
 
 log = logging.getLogger(__name__)
 
+# Sub-resources that never contribute links. Aborting them in the browser saves
+# their download and most of the render time on asset-heavy pages.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# quick_nav: how long to wait for DOMContentLoaded after the first byte.
+QUICK_NAV_GRACE_MS = 2000
+
+
+async def _block_subresources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 @dataclass
 class Crawler:
@@ -64,7 +82,11 @@ class Crawler:
     seed_urls: List[str] | None = None
 
     # Internal BFS state
-    queue: Deque[tuple[str, int]] = field(default_factory=deque)
+    # Created in __aenter__, inside the running loop (asyncio.Queue binds to
+    # the loop at construction on Python < 3.10).
+    queue: asyncio.Queue[tuple[str, int]] = field(init=False, repr=False)
+    # URLs currently in `queue`; O(1) dedup at enqueue and for link_logic
+    queued_urls: Set[str] = field(default_factory=set)
     visited_urls: Set[str] = field(default_factory=set)
     evidence_producing_urls: Set[str] = field(default_factory=set)
     evidence: List[EvidenceRecord] = field(default_factory=list)
@@ -73,66 +95,102 @@ class Crawler:
     # second-degree tracking
     parent: Dict[str, str] = field(default_factory=dict)  # C -> B
     pivot_has_backlink_to_origin: Set[str] = field(default_factory=set)  # B with B→A
-    pivot_outlinked: Dict[str, Set[str]] = field(default_factory=dict)  # B -> {C}
 
-    # Playwright state
-    _playwright: Playwright = field(init=False, repr=False)
-    _browser: Browser = field(init=False, repr=False)
+    # Playwright state (the browser itself is shared; see browser_pool)
+    _context: BrowserContext = field(init=False, repr=False)
     _page: Page = field(init=False, repr=False)
 
     # Derived
     normalized_origin_url: str = field(init=False)
+    _logic_cfg: LogicConfig = field(init=False, repr=False)
 
     async def __aenter__(self) -> "Crawler":
-        """Starts Playwright, launches Chromium, creates a page, sets UA, initializes queue."""
+        """Opens a context on the shared browser with our UA, creates a page, initializes queue."""
         log.info("Starting headless browser session...")
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch()
-        self._page = await self._browser.new_page()
-
         user_agent = self.config.get(
             "user_agent",
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/107.0.0.0 Safari/537.36",
         )
-        await self._page.set_extra_http_headers({"User-Agent": user_agent})
-        log.info("Browser User-Agent set.")
+        browser = await get_browser()
+        try:
+            # One context for the whole crawl: every worker page shares its
+            # cookies and HTTP cache. Service workers are blocked because
+            # requests they serve bypass context.route(), and they cost an extra
+            # script fetch.
+            self._context = await browser.new_context(
+                user_agent=user_agent, service_workers="block"
+            )
+            await self._context.route("**/*", _block_subresources)
+            self._page = await self._context.new_page()
+        except BaseException:
+            # __aexit__ won't run if __aenter__ fails; give the reference back.
+            await release_browser()
+            raise
+        self.queue = asyncio.Queue()
+        log.info("Browser context ready (User-Agent set).")
 
         self.normalized_origin_url = normalize_url(self.origin_url)
+        self._logic_cfg = self._build_logic_config()
 
         # Initialize BFS queue
         if self.seed_urls:
             # Treat seeds as first-hop candidates; mark origin as visited
             self.visited_urls.add(self.normalized_origin_url)
             for url in self.seed_urls:
-                self.queue.append((normalize_url(url), 1))
-            log.info("Queue initialized with %d seed URL(s).", len(self.seed_urls))
-        else:
-            self.queue.append((self.normalized_origin_url, 0))
+                self._enqueue(normalize_url(url), 1)
+            log.info("Queue initialized with %d seed URL(s).", self.queue.qsize())
+        elif self._enqueue(self.normalized_origin_url, 0):
             log.info("Queue initialized with origin: %s", self.normalized_origin_url)
 
         return self
 
+    def _build_logic_config(self) -> LogicConfig:
+        return LogicConfig(
+            max_outlinks=self.config.get("max_outlinks", 50),
+            trusted_domains=self.config.get("trusted", []),
+            same_domain_policy=self.config.get("same_domain_policy", "no-self-domain"),
+            use_registrable_domain=self.config.get("use_registrable_domain", False),
+            blacklist_patterns=self.config.get("blacklist", []),
+            whitelist_patterns=self.config.get("whitelist", []),
+            only_whitelist=self.config.get("only_whitelist", False),
+        )
+
+    def _admit(self, url: str) -> bool:
+        """Enqueue-time filter: only fetchable, likely-HTML, non-blacklisted URLs."""
+        if not is_crawlable_url(url, self._logic_cfg):
+            log.info("Not queueing non-HTML, non-http(s) or blacklisted URL: %s", url)
+            return False
+        return True
+
+    def _enqueue(self, url: str, hops: int) -> bool:
+        """Append (url, hops) unless already visited/queued or rejected by _admit."""
+        if url in self.visited_urls or url in self.queued_urls:
+            return False
+        if not self._admit(url):
+            return False
+        self.queue.put_nowait((url, hops))
+        self.queued_urls.add(url)
+        return True
+
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Tears down the browser cleanly."""
+        """Closes this crawler's context and releases the shared browser."""
         log.info("Closing headless browser session...")
         try:
-            await self._browser.close()
+            await self._context.close()
         finally:
-            await self._playwright.stop()
+            await release_browser()
         log.info("Browser session closed.")
 
-    async def _fetch_and_parse(self, url: str) -> tuple[str, BeautifulSoup] | None:
+    async def _fetch_and_parse(
+        self, page: Page, url: str
+    ) -> tuple[str, List[HrefElement]] | None:
         """
-        Navigate to `url`, wait for DOMContentLoaded, and return (final_url, soup).
+        Navigate to `url`, wait for DOMContentLoaded, and return
+        (final_url, link elements).
         Records errors for network/HTTP failures and non-HTML content.
+        Scheme, extension and blacklist filtering happen at enqueue time (_admit).
         """
-        if not is_fetchable_url(url):
-            log.info("Skipping non-fetchable URL (scheme not http/https): %s", url)
-            return None
-        if not is_probably_html_url(url):
-            log.info("Skip non-HTML by extension: %s", url)
-            return None
         if url in self.visited_urls:
             log.debug("Skipping already visited URL: %s", url)
             return None
@@ -141,9 +199,22 @@ class Crawler:
         try:
             timeout_ms = int(self.config.get("timeout", 10.0) * 1000)
             log.debug("Navigating to %s (timeout=%sms)...", url, timeout_ms)
-            response = await self._page.goto(
-                url, wait_until="domcontentloaded", timeout=timeout_ms
-            )
+            if self.config.get("quick_nav", False):
+                # Return on the first response byte, then give the parser a short
+                # grace period; server-rendered links are in the HTML by then.
+                response = await page.goto(url, wait_until="commit", timeout=timeout_ms)
+                try:
+                    await page.wait_for_load_state(
+                        "domcontentloaded", timeout=QUICK_NAV_GRACE_MS
+                    )
+                except PlaywrightTimeoutError:
+                    log.debug(
+                        "DOMContentLoaded not reached for %s; using partial DOM", url
+                    )
+            else:
+                response = await page.goto(
+                    url, wait_until="domcontentloaded", timeout=timeout_ms
+                )
 
             if response is None:
                 msg = f"No response from {url}"
@@ -169,7 +240,7 @@ class Crawler:
                 log.info("Skipping non-HTML content at %s (%s)", url, ctype)
                 return None
 
-            html = await self._page.content()
+            html = await page.content()
             max_bytes = self.config.get("max_content_bytes", 1024 * 1024)
             if len(html) > max_bytes:
                 msg = f"Content too large at {url} ({len(html)} > {max_bytes})"
@@ -177,12 +248,15 @@ class Crawler:
                 self.errors.append(msg)
                 return None
 
-            final_url = normalize_url(self._page.url or url)
-            if final_url != normalize_url(url):
+            final_url = normalize_url(page.url or url)
+            if final_url != url:  # queued URLs are already normalized
                 log.info("Navigation redirected: %s -> %s", url, final_url)
 
-            soup = BeautifulSoup(html, "html.parser")
-            return final_url, soup
+            # Same lxml-backed, link-only parse as the httpx crawler, off the
+            # event loop so the other workers' pages keep moving.
+            loop = asyncio.get_running_loop()
+            elements = await loop.run_in_executor(None, parse_links, html)
+            return final_url, elements
 
         except Exception as e:
             msg = f"An exception occurred while fetching {url}: {e}"
@@ -190,21 +264,132 @@ class Crawler:
             self.errors.append(msg)
             return None
 
+    async def _process_url(
+        self,
+        page: Page,
+        current_url: str,
+        hops: int,
+        cfg: LogicConfig,
+        only_rel_me: bool,
+        max_hops: int,
+    ) -> None:
+        """Fetch one queued URL on `page` and apply the A → B / B → A / C → B logic."""
+        # Blacklist/scheme/extension filtering happened in _admit before enqueue;
+        # whitelist logic is handled in queue_candidates_*
+
+        if hops >= max_hops:
+            log.debug("Max hops reached (%d) for %s; skipping.", hops, current_url)
+            return
+
+        fetched = await self._fetch_and_parse(page, current_url)
+        if not fetched:
+            return
+
+        final_url_on_page, elements = fetched
+        log.info("Found %d link element(s) on %s.", len(elements), final_url_on_page)
+
+        is_origin_page = final_url_on_page == self.normalized_origin_url
+
+        if is_origin_page:
+            # A → B
+            # On the origin, select outbound candidates respecting policy and limits.
+            next_candidates = queue_candidates_from_origin(
+                current_url=final_url_on_page,
+                origin_url=self.normalized_origin_url,
+                elements=elements,
+                cfg=cfg,
+                already_queued=self.queued_urls,
+                visited=self.visited_urls,
+            )
+            for url in next_candidates:
+                if self._enqueue(url, hops + 1):
+                    log.debug("Queueing candidate (%d -> %d): %s", hops, hops + 1, url)
+            log.info("Queued %d candidate URL(s) from origin.", len(next_candidates))
+        else:
+            # B → A
+            # On a candidate page, detect a backlink (first match only).
+            # The index also serves the C → B check below; it stops scanning
+            # once both targets are found.
+            wanted = {self.normalized_origin_url}
+            if final_url_on_page in self.parent:
+                wanted.add(self.parent[final_url_on_page])
+            links = index_links(final_url_on_page, elements, wanted)
+            tag = links.get(self.normalized_origin_url)
+
+            # --- NEW: Check for only_rel_me mode ---
+            if tag is not None and only_rel_me:
+                rels = _rel_list(tag)
+                if "me" not in rels:
+                    log.info(
+                        "Found backlink, but ignoring (not rel=me) in only-rel-me mode: %s",
+                        final_url_on_page,
+                    )
+                    tag = None  # Discard the tag, skipping evidence creation
+            # --- End new check ---
+
+            if tag is not None:
+                ev = make_evidence(
+                    source_url=final_url_on_page,
+                    origin_url=self.normalized_origin_url,
+                    hops=hops,
+                    tag=tag,
+                    cfg=cfg,
+                    ordinal=len(self.evidence) + 1,
+                )
+                self.evidence.append(ev)
+                self.evidence_producing_urls.add(final_url_on_page)
+                self.pivot_has_backlink_to_origin.add(final_url_on_page)
+                log.info(
+                    "Backlink detected from %s (classification=%s).",
+                    final_url_on_page,
+                    ev.classification,
+                )
+
+                # BUGFIX: Only queue this page's outlinks (B->C) if it links back to origin (B->A).
+                next_neighbors = queue_candidates_from_pivot(
+                    current_url=final_url_on_page,
+                    pivot_url=final_url_on_page,
+                    origin_url=self.normalized_origin_url,
+                    elements=elements,
+                    cfg=cfg,
+                    already_queued=self.queued_urls,
+                    visited=self.visited_urls,
+                )
+                for c in next_neighbors:
+                    if c not in self.parent:
+                        self.parent[c] = final_url_on_page
+                    self._enqueue(c, hops + 1)
+            else:
+                log.info("No backlink to origin found on %s.", final_url_on_page)
+
+            # C → B validation (strict mutual chain)
+            if final_url_on_page in self.parent:
+                pivot_url = self.parent[final_url_on_page]
+                tag_to_pivot = links.get(pivot_url)
+                if (
+                    tag_to_pivot is not None
+                    and pivot_url in self.pivot_has_backlink_to_origin
+                ):
+                    ev_ind = make_indirect_evidence(
+                        origin_url=self.normalized_origin_url,
+                        pivot_url=pivot_url,
+                        neighbor_url=final_url_on_page,
+                        hops=hops,
+                        ordinal=len(self.evidence) + 1,
+                    )
+                    # Do not add indirect evidence if in only_rel_me mode
+                    if not only_rel_me:
+                        self.evidence.append(ev_ind)
+                        self.evidence_producing_urls.add(final_url_on_page)
+                    else:
+                        log.debug("Skipping indirect evidence in only-rel-me mode.")
+
     async def crawl(self) -> None:
         """
         BFS crawl. On origin page: discover next-hop candidates.
         On candidate pages: detect the first backlink to origin and record evidence.
         """
-        # Pass new config values to LogicConfig
-        cfg = LogicConfig(
-            max_outlinks=self.config.get("max_outlinks", 50),
-            trusted_domains=self.config.get("trusted", []),
-            same_domain_policy=self.config.get("same_domain_policy", "no-self-domain"),
-            use_registrable_domain=self.config.get("use_registrable_domain", False),
-            blacklist_patterns=self.config.get("blacklist", []),
-            whitelist_patterns=self.config.get("whitelist", []),
-            only_whitelist=self.config.get("only_whitelist", False),
-        )
+        cfg = self._logic_cfg
 
         # Get rel-me policy for use in this method
         only_rel_me = self.config.get("only_rel_me", False)
@@ -218,140 +403,44 @@ class Crawler:
             cfg.same_domain_policy,
         )
 
-        while self.queue:
-            log.debug(
-                "Queue=%d, Visited=%d, Evidence=%d, Errors=%d",
-                len(self.queue),
-                len(self.visited_urls),
-                len(self.evidence),
-                len(self.errors),
-            )
-            current_url, hops = self.queue.popleft()
-
-            # 🔒 Skip blacklisted before any network I/O
-            if is_blacklisted(current_url, cfg):
-                log.info("Skipping blacklisted URL: %s", current_url)
-                continue
-
-            # Whitelist logic is handled in queue_candidates_*
-
-            if hops >= max_hops:
-                log.debug("Max hops reached (%d) for %s; skipping.", hops, current_url)
-                continue
-
-            fetched = await self._fetch_and_parse(current_url)
-            if not fetched:
-                continue
-
-            final_url_on_page, soup = fetched
-            elements = extract_href_elements(soup)
-            log.info(
-                "Found %d link element(s) on %s.", len(elements), final_url_on_page
-            )
-
-            is_origin_page = final_url_on_page == self.normalized_origin_url
-
-            if is_origin_page:
-                # A → B
-                # On the origin, select outbound candidates respecting policy and limits.
-                next_candidates = queue_candidates_from_origin(
-                    current_url=final_url_on_page,
-                    origin_url=self.normalized_origin_url,
-                    elements=elements,
-                    cfg=cfg,
-                    already_queued=(q[0] for q in self.queue),
-                    visited=self.visited_urls,
-                )
-                for url in next_candidates:
-                    log.debug("Queueing candidate (%d -> %d): %s", hops, hops + 1, url)
-                    self.queue.append((url, hops + 1))
-                log.info(
-                    "Queued %d candidate URL(s) from origin.", len(next_candidates)
-                )
-            else:
-                # B → A
-                # On a candidate page, detect a backlink (first match only).
-                tag = detect_backlink_element(
-                    current_url=final_url_on_page,
-                    origin_url=self.normalized_origin_url,
-                    elements=elements,
-                )
-
-                # --- NEW: Check for only_rel_me mode ---
-                if tag is not None and only_rel_me:
-                    rels = _rel_list(tag)
-                    if "me" not in rels:
-                        log.info(
-                            "Found backlink, but ignoring (not rel=me) in only-rel-me mode: %s",
-                            final_url_on_page,
-                        )
-                        tag = None  # Discard the tag, skipping evidence creation
-                # --- End new check ---
-
-                if tag is not None:
-                    ev = make_evidence(
-                        source_url=final_url_on_page,
-                        origin_url=self.normalized_origin_url,
-                        hops=hops,
-                        tag=tag,
-                        cfg=cfg,
-                        ordinal=len(self.evidence) + 1,
+        # N workers, each driving its own page in this crawler's context, pull from
+        # one queue. No locks are needed around the shared sets/dicts: everything
+        # runs on one event loop, and each check-then-update on them (visited,
+        # queued, parent, evidence ordinal) has no await in between.
+        concurrency = max(1, int(self.config.get("playwright_concurrency", 4)))
+        pages = [self._page]
+        for _ in range(concurrency - 1):
+            pages.append(await self._context.new_page())
+
+        async def worker(page: Page) -> None:
+            while True:
+                current_url, hops = await self.queue.get()
+                try:
+                    self.queued_urls.discard(current_url)
+                    log.debug(
+                        "Queue=%d, Visited=%d, Evidence=%d, Errors=%d",
+                        self.queue.qsize(),
+                        len(self.visited_urls),
+                        len(self.evidence),
+                        len(self.errors),
                     )
-                    self.evidence.append(ev)
-                    self.evidence_producing_urls.add(final_url_on_page)
-                    self.pivot_has_backlink_to_origin.add(final_url_on_page)
-                    log.info(
-                        "Backlink detected from %s (classification=%s).",
-                        final_url_on_page,
-                        ev.classification,
+                    await self._process_url(
+                        page, current_url, hops, cfg, only_rel_me, max_hops
                     )
+                finally:
+                    self.queue.task_done()
 
-                    # BUGFIX: Only queue this page's outlinks (B->C) if it links back to origin (B->A).
-                    next_neighbors = queue_candidates_from_pivot(
-                        current_url=final_url_on_page,
-                        pivot_url=final_url_on_page,
-                        origin_url=self.normalized_origin_url,
-                        elements=elements,
-                        cfg=cfg,
-                        already_queued=(q[0] for q in self.queue),
-                        visited=self.visited_urls,
-                    )
-                    if next_neighbors:
-                        self.pivot_outlinked.setdefault(
-                            final_url_on_page, set()
-                        ).update(next_neighbors)
-                        for c in next_neighbors:
-                            if c not in self.parent:
-                                self.parent[c] = final_url_on_page
-                            self.queue.append((c, hops + 1))
-                else:
-                    log.info("No backlink to origin found on %s.", final_url_on_page)
-
-                # C → B validation (strict mutual chain)
-                if final_url_on_page in self.parent:
-                    pivot_url = self.parent[final_url_on_page]
-                    tag_to_pivot = detect_backlink_element(
-                        current_url=final_url_on_page,
-                        origin_url=pivot_url,
-                        elements=elements,
-                    )
-                    if (
-                        tag_to_pivot is not None
-                        and pivot_url in self.pivot_has_backlink_to_origin
-                    ):
-                        ev_ind = make_indirect_evidence(
-                            origin_url=self.normalized_origin_url,
-                            pivot_url=pivot_url,
-                            neighbor_url=final_url_on_page,
-                            hops=hops,
-                            ordinal=len(self.evidence) + 1,
-                        )
-                        # Do not add indirect evidence if in only_rel_me mode
-                        if not only_rel_me:
-                            self.evidence.append(ev_ind)
-                            self.evidence_producing_urls.add(final_url_on_page)
-                        else:
-                            log.debug("Skipping indirect evidence in only-rel-me mode.")
+        workers = [asyncio.create_task(worker(page)) for page in pages]
+        drained = asyncio.ensure_future(self.queue.join())
+        try:
+            await asyncio.wait({drained, *workers}, return_when=asyncio.FIRST_COMPLETED)
+            for w in workers:
+                if w.done():
+                    w.result()  # a worker only stops early on a bug: re-raise it
+        finally:
+            for t in (drained, *workers):
+                t.cancel()
+            await asyncio.gather(drained, *workers, return_exceptions=True)
 
         log.info(
             "Crawl finished. Evidence=%d, Errors=%d.",
@@ -359,6 +448,11 @@ class Crawler:
             len(self.errors),
         )
 
+    @property
+    def pivot_outlinked(self) -> Dict[str, Set[str]]:
+        """B -> {C} view of `parent`, built on demand (see pivot_neighbors)."""
+        return pivot_neighbors(self.parent)
+
     def get_results(self) -> tuple[List[EvidenceRecord], List[str]]:
         """Expose collected evidence and errors."""
         return self.evidence, self.errors
@@ -3,22 +3,65 @@
 
 from __future__ import annotations
 
-from naive_backlink.models import EvidenceRecord, ScoreLabel
+from typing import Iterable
 
+from naive_backlink.models import INDIRECT, STRONG, WEAK, EvidenceRecord, ScoreLabel
 
-def calculate_score(evidence: list[EvidenceRecord]) -> tuple[int, ScoreLabel]:
+# Indexed by (score >= 50) + (score >= 80).
+_LABELS: tuple[ScoreLabel, ScoreLabel, ScoreLabel] = ("low", "medium", "high")
+
+
+def calculate_score(evidence: Iterable[EvidenceRecord]) -> tuple[int, ScoreLabel]:
     """
-    Calculates a final score based on a list of evidence records.
+    Calculates a final score based on the evidence records (any iterable; it is
+    consumed once).
 
     score = 60 * S + 30 * W + 10 * I - P
 
     The coefficients here are adjusted from the initial PEP draft to align with
     the textual descriptions of the test vectors, which the original formula did not.
     """
-    strong_count = sum(1 for ev in evidence if ev.classification == "strong")
-    weak_count = sum(1 for ev in evidence if ev.classification == "weak")
-    indirect_count = sum(1 for ev in evidence if ev.classification == "indirect")
+    return _score_from_counts(*_count_classes(evidence))
+
+
+def calculate_scores_batch(
+    batches: Iterable[Iterable[EvidenceRecord]],
+) -> list[tuple[int, ScoreLabel]]:
+    """
+    calculate_score() for many origins at once, e.g. a dashboard over thousands of
+    profiles. Returns one (score, label) per batch, in order.
+
+    Each batch is counted in one pass; scores are memoized by their
+    (strong, weak, indirect) counts, which only take a handful of distinct values
+    once saturated, so most batches skip the arithmetic entirely.
+    """
+    memo: dict[tuple[int, int, int], tuple[int, ScoreLabel]] = {}
+    out: list[tuple[int, ScoreLabel]] = []
+    for batch in batches:
+        strong, weak, indirect = _count_classes(batch)
+        # Saturation points of S, W and I (see _score_from_counts).
+        key = (min(strong, 1), min(weak, 2), min(indirect, 5))
+        result = memo.get(key)
+        if result is None:
+            result = memo[key] = _score_from_counts(*key)
+        out.append(result)
+    return out
 
+
+def _count_classes(evidence: Iterable[EvidenceRecord]) -> tuple[int, int, int]:
+    """
+    (strong, weak, indirect) counts. One pass pulls the tags into a list, then
+    list.count() runs in C; the tags are the interned models constants, so each
+    comparison is a pointer check. Several times faster than a Counter for the
+    handful of records a typical crawl yields.
+    """
+    tags = [ev.classification for ev in evidence]
+    return tags.count(STRONG), tags.count(WEAK), tags.count(INDIRECT)
+
+
+def _score_from_counts(
+    strong_count: int, weak_count: int, indirect_count: int
+) -> tuple[int, ScoreLabel]:
     # --- Placeholder for penalty calculation ---
     # P = penalties = 20 if any_untrusted_echo else 0
     #           + 10 * min(excess_hops, 3)
@@ -39,12 +82,5 @@ def calculate_score(evidence: list[EvidenceRecord]) -> tuple[int, ScoreLabel]:
     score = int(85 * s + 50 * w + 10 * i - penalties)
     score = max(0, min(100, score))  # Clamp score between 0 and 100
 
-    # Determine label
-    if score >= 80:
-        label: ScoreLabel = "high"
-    elif score >= 50:
-        label = "medium"
-    else:
-        label = "low"
-
-    return score, label
+    # Determine label: high >= 80, medium >= 50, else low
+    return score, _LABELS[(score >= 50) + (score >= 80)]
@@ -0,0 +1,131 @@
+# naive_backlink/state.py
+"""
+Resumable crawl state (config key `state_path`).
+
+The httpx crawler writes its frontier and findings to a JSON file when it exits
+and reads them back on the next run for the same origin, so a crashed or
+repeated crawl picks up where it stopped instead of re-fetching every page.
+
+Saved: visited URLs, pending (url, hops) pairs, the neighbor -> pivot map,
+pivots with a backlink to origin, evidence and errors. Evidence is restored
+with the visited set because a visited page is never fetched again, so its
+evidence could not be rediscovered.
+
+The file also records a fingerprint of the settings that shape the crawl
+(hops, outlink cap, URL patterns, domain policy). A file saved under other
+settings describes a different crawl and is ignored, like one for another
+origin.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+from naive_backlink.models import EvidenceRecord, LinkDetails, URLContext
+
+log = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+# Config keys that decide which URLs are fetched and what counts as evidence.
+FINGERPRINT_KEYS = (
+    "max_hops",
+    "max_outlinks",
+    "trusted",
+    "blacklist",
+    "whitelist",
+    "only_whitelist",
+    "only_rel_me",
+    "same_domain_policy",
+    "use_registrable_domain",
+)
+
+
+def config_fingerprint(config: Mapping[str, Any]) -> str:
+    """Stable hash of the FINGERPRINT_KEYS values; pattern lists are order-free."""
+    relevant: Dict[str, Any] = {}
+    for key in FINGERPRINT_KEYS:
+        value = config.get(key)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            value = sorted(value)
+        relevant[key] = value
+    blob = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def evidence_from_dict(d: Dict[str, Any]) -> EvidenceRecord:
+    """Inverse of dataclasses.asdict() for an EvidenceRecord."""
+    d = dict(d)
+    # Re-intern the small vocabularies, like the records built by link_logic.
+    for key in ("kind", "classification"):
+        if d.get(key) is not None:
+            d[key] = sys.intern(d[key])
+    for key in ("source", "target"):
+        ctx = d[key]
+        d[key] = URLContext(url=ctx["url"], context=sys.intern(ctx["context"]))
+    if d.get("link") is not None:
+        d["link"] = LinkDetails(**d["link"])
+    return EvidenceRecord(**d)
+
+
+def load_crawl_state(
+    path: str | os.PathLike[str], origin: str, config: Mapping[str, Any]
+) -> Dict[str, Any] | None:
+    """
+    Read the state saved for `origin` under `config`, or None if there is none.
+    A missing, unreadable or foreign file (other origin, version or crawl
+    settings) is ignored, not an error.
+    """
+    p = Path(path)
+    if not p.exists():
+        return None
+    try:
+        with p.open(encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring unreadable crawl state %s: %s", p, e)
+        return None
+    if data.get("version") != STATE_VERSION or data.get("origin") != origin:
+        log.info("Crawl state %s is for another origin or version; starting fresh.", p)
+        return None
+    if data.get("config") != config_fingerprint(config):
+        log.info("Crawl state %s is for other crawl settings; starting fresh.", p)
+        return None
+    data["evidence"] = [evidence_from_dict(ev) for ev in data.get("evidence", [])]
+    return data
+
+
+def save_crawl_state(
+    path: str | os.PathLike[str],
+    origin: str,
+    state: Dict[str, Any],
+    config: Mapping[str, Any],
+) -> None:
+    """
+    Write `state` for `origin`, tagged with the fingerprint of `config`.
+    EvidenceRecords are converted with asdict(); sets become lists. Written to a
+    temp file and renamed, so a crash mid-write never leaves a truncated file
+    behind.
+    """
+    p = Path(path)
+    data: Dict[str, Any] = {
+        "version": STATE_VERSION,
+        "origin": origin,
+        "config": config_fingerprint(config),
+    }
+    for key, value in state.items():
+        if key == "evidence":
+            value = [asdict(ev) for ev in value]
+        elif isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        data[key] = value
+    tmp = p.with_name(p.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, p)
@@ -2,53 +2,91 @@
 # Presentation-only utilities for CLI output.
 from __future__ import annotations
 
-from typing import IO, Iterable
+import io
+from typing import IO, Iterable, Sequence
 
-from naive_backlink.models import Result
+from naive_backlink.models import INDIRECT, STRONG, WEAK, Result
 
-
-def _writeln(text: str = "", *, file: IO[str]) -> None:
-    file.write(text + "\n")
+# Upper-cased, padded evidence labels, so the evidence loop is a dict hit per
+# record; anything else falls back to formatting on the fly.
+_CLS_LABEL: dict[str | None, str] = {
+    cls: f"{(cls or '').upper():<8}" for cls in (STRONG, WEAK, INDIRECT, "", None)
+}
 
 
 def render_verify_header(url: str, *, file: IO[str]) -> None:
-    _writeln(f"Verifying backlinks for: {url}...", file=file)
+    file.write(f"Verifying backlinks for: {url}...\n")
 
 
 def render_score_line(result: Result, *, file: IO[str]) -> None:
-    _writeln(f"\nScore: {result.score} ({result.label})", file=file)
+    file.write(f"\nScore: {result.score} ({result.label})\n")
 
 
 def render_evidence_section(result: Result, *, file: IO[str]) -> None:
     if not result.evidence:
         return
-    _writeln("\n--- Evidence Found ---", file=file)
+    # Build the section, then write it once: one write() per section instead of
+    # one per line, which matters when `file` is unbuffered.
+    buf: list[str] = ["\n--- Evidence Found ---\n"]
+    append = buf.append  # bound once, not looked up per line
+    label_get = _CLS_LABEL.get
     for ev in result.evidence:
-        cls = (ev.classification or "").upper()
-        _writeln(f"- [{cls:<8}] on: {ev.target.url}", file=file)
+        cls = ev.classification
+        label = label_get(cls) or f"{(cls or '').upper():<8}"
+        append(f"- [{label}] on: {ev.target.url}\n")
+    file.write("".join(buf))
 
 
 def render_link_graph_section(
     origin: str | None,
-    direct: Iterable[str],
+    direct: Sequence[str],
     edges: dict[str, list[str]],
     *,
     file: IO[str],
 ) -> None:
+    """
+    Renders pivots and their neighbors in the order given: the caller passes
+    `direct` deduplicated and sorted, and each `edges` list sorted (see
+    cli._build_link_graph_inputs), so nothing is re-sorted per render.
+    """
     if not origin:
         return
-    _writeln("\n--- Link Graph ---", file=file)
-    _writeln(f"{origin}", file=file)
-    for b in sorted(set(direct)):
-        _writeln(f"├─ {b}  [direct]", file=file)
-        for c in sorted(edges.get(b, [])):
-            _writeln(f"│  └─ {c}  [indirect via {b}]", file=file)
+    buf: list[str] = [f"\n--- Link Graph ---\n{origin}\n"]
+    append = buf.append
+    edges_get = edges.get
+    for b in direct:
+        append(f"├─ {b}  [direct]\n")
+        children = edges_get(b)
+        if not children:
+            continue  # most pivots have no neighbors: no [] default
+        for c in children:
+            append(f"│  └─ {c}  [indirect via {b}]\n")
+    file.write("".join(buf))
 
 
 def render_errors_section(errors: Iterable[str], *, file: IO[str]) -> None:
     errs = list(errors)
     if not errs:
         return
-    _writeln("\n--- Errors Encountered ---", file=file)
-    for e in errs:
-        _writeln(f"- {e}", file=file)
+    buf: list[str] = ["\n--- Errors Encountered ---\n"]
+    buf.extend(f"- {e}\n" for e in errs)
+    file.write("".join(buf))
+
+
+def render_report(
+    result: Result,
+    origin: str | None,
+    direct: Sequence[str],
+    edges: dict[str, list[str]],
+) -> str:
+    """
+    Score line, evidence, link graph and errors as one string, for a single
+    write() to the real stream (a pipe or SSH session may flush every write).
+    The render_* functions above stay usable on their own for streaming output.
+    """
+    buf = io.StringIO()
+    render_score_line(result, file=buf)
+    render_evidence_section(result, file=buf)
+    render_link_graph_section(origin, direct, edges, file=buf)
+    render_errors_section(result.errors, file=buf)
+    return buf.getvalue()
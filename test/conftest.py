@@ -0,0 +1,24 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from naive_backlink.link_logic import parse_html
+
+
+def pytest_configure(config):
+    # pytest-xdist registers this marker itself; declare it for runs without it.
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run on the same xdist worker (--dist loadgroup)"
+    )
+
+
+@pytest.fixture(scope="session")
+def make_soup():
+    """
+    Parse test HTML exactly as the crawlers do: lxml, keeping only <a href> and
+    <link href> (LINK_STRAINER), so find_all(True) walks just the links.
+    """
+
+    def _make(html: str) -> BeautifulSoup:
+        return parse_html(html)
+
+    return _make
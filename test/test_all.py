@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from naive_backlink.models import EvidenceRecord, LinkDetails, URLContext
+import dataclasses
+import sys
+
+import pytest
+
+from naive_backlink.models import EvidenceRecord, LinkDetails, Result, URLContext
 from naive_backlink.scoring import calculate_score
 
 
@@ -65,3 +70,25 @@ def test_score_with_no_evidence():
     score, label = calculate_score([])
     assert score == 0
     assert label == "low"
+
+
+def test_evidence_models_are_frozen_and_slotted():
+    ctx = URLContext(url="https://a.example", context="origin-page")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        ctx.url = "https://b.example"  # type: ignore[misc]
+    if sys.version_info >= (3, 10):
+        assert not hasattr(ctx, "__dict__")
+        assert not hasattr(LinkDetails(html="<a>"), "__dict__")
+        assert not hasattr(Result("https://a.example", 0, "low"), "__dict__")
+
+
+def test_evidence_vocabulary_is_shared_interned_strings():
+    from naive_backlink.link_logic import make_indirect_evidence
+    from naive_backlink.models import CANDIDATE_PAGE, INDIRECT
+
+    ev = make_indirect_evidence(
+        "https://a.example", "https://b.example", "https://c.example", 2, 1
+    )
+    assert ev.classification is INDIRECT
+    assert ev.target.context is CANDIDATE_PAGE
+    assert INDIRECT == "indirect"
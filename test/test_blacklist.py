@@ -1,14 +1,22 @@
+import fnmatch
+
 import pytest
-from bs4 import BeautifulSoup
 
 from naive_backlink.link_logic import (
     LogicConfig,
+    _compile_patterns,
+    _host_and_hostpath,
     is_blacklisted,
+    is_crawlable_url,
     normalize_url,
     queue_candidates_from_origin,
     queue_candidates_from_pivot,
 )
 
+# The URL matrices share link_logic's compiled-pattern and parse caches; keep
+# them on one xdist worker so those caches are warmed once (`-n N --dist loadgroup`).
+pytestmark = pytest.mark.xdist_group("link_logic")
+
 # Base blacklist copied from api._load_config() docstring semantics
 BASE_PATTERNS = [
     "joinmastodon.org/*",
@@ -54,50 +62,118 @@ CFG = LogicConfig(
 )
 
 
+# (url, expected) cases shared by the matrix and the fnmatch cross-check.
+MATRIX = [
+    # domain-wide rule with /* suffix
+    ("https://joinmastodon.org", True),
+    ("https://joinmastodon.org/servers", True),
+    ("https://news.joinmastodon.org", True),  # via *.joinmastodon.org/*
+    ("https://docs.joinmastodon.org/admin/config", True),
+    # github “attractive nuisances”
+    ("https://github.com/sponsors", True),
+    ("https://github.com/sponsors/pypa", True),
+    ("https://github.com/trending/python?since=daily", True),
+    ("https://github.com/features/code-security", True),
+    ("https://github.com/resources/case-studies", True),
+    ("https://github.com/marketplace", True),
+    # NOT blacklisted: a normal user/org repo page
+    ("https://github.com/pypa/pip", False),
+    # stackoverflow.*
+    ("https://stackoverflow.co/company", True),
+    ("https://meta.stackoverflow.co/", True),
+    ("https://stackoverflow.blog/inside-stack/", True),
+    ("https://api.stackexchange.com/2.3/questions", True),
+    # social anti-bot
+    ("https://x.com/someuser/status/123", True),
+    ("https://twitter.com/abc", True),
+    ("https://linkedin.com/in/matthewdeanmartin", True),
+    ("https://reddit.com/r/something", True),
+    # not blacklisted
+    ("https://example.org/about", False),
+    ("https://pypi.org/project/requests/", False),
+]
+
+
+@pytest.mark.parametrize("url,expected", MATRIX)
+def test_is_blacklisted_matrix(url, expected):
+    assert is_blacklisted(url, CFG) is expected
+
+
+def _fnmatch_reference(url, patterns):
+    # The original per-pattern loop, kept here as the spec for the compiled regex.
+    host, hostpath = _host_and_hostpath(url)
+    forms = [host, f"{host}/", f"{host}/*", hostpath, f"{hostpath}/", f"{hostpath}/*"]
+    for pat in patterns:
+        p = pat.lower().strip()
+        if any(fnmatch.fnmatchcase(c, p) for c in forms):
+            return True
+        if p.startswith("*."):
+            suffix = p[2:].replace("/*", "").rstrip("/")
+            if host.endswith(suffix) and host != suffix:
+                return True
+    return False
+
+
+@pytest.mark.parametrize("url", [url for url, _ in MATRIX])
+def test_compiled_patterns_agree_with_fnmatch_loop(url):
+    assert is_blacklisted(url, CFG) is _fnmatch_reference(url, BASE_PATTERNS)
+
+
+def test_matching_reuses_the_config_compiled_regex():
+    # CFG compiled its patterns when it was built; matching never compiles again.
+    before = _compile_patterns.cache_info()
+    assert [is_blacklisted(url, CFG) for url, _ in MATRIX] == [e for _, e in MATRIX]
+    after = _compile_patterns.cache_info()
+    assert (after.hits, after.misses) == (before.hits, before.misses)
+
+
+def test_compile_patterns_is_cached_per_pattern_tuple():
+    key = tuple(BASE_PATTERNS)
+    assert _compile_patterns(key) is _compile_patterns(key)
+
+
+def test_logic_config_compiles_patterns_once():
+    assert CFG._blacklist_compiled is _compile_patterns(tuple(BASE_PATTERNS))
+    assert CFG._whitelist_compiled is _compile_patterns(())
+
+
+def test_literal_and_prefix_patterns_skip_the_regex():
+    compiled = CFG._blacklist_compiled
+    assert "github.com/solutions" in compiled.literals
+    assert "github.com/sponsors/" in compiled.prefixes
+    # Only the real globs are left for the regex.
+    assert compiled.regex is not None
+    assert "sponsors" not in compiled.regex.pattern
+    assert compiled.suffixes == ("joinmastodon.org", "stackoverflow.co", "forem.com")
+
+
 @pytest.mark.parametrize(
-    "url,expected",
+    "url",
     [
-        # domain-wide rule with /* suffix
-        ("https://joinmastodon.org", True),
-        ("https://joinmastodon.org/servers", True),
-        ("https://news.joinmastodon.org", True),  # via *.joinmastodon.org/*
-        ("https://docs.joinmastodon.org/admin/config", True),
-        # github “attractive nuisances”
-        ("https://github.com/sponsors", True),
-        ("https://github.com/sponsors/pypa", True),
-        ("https://github.com/trending/python?since=daily", True),
-        ("https://github.com/features/code-security", True),
-        ("https://github.com/resources/case-studies", True),
-        ("https://github.com/marketplace", True),
-        # NOT blacklisted: a normal user/org repo page
-        ("https://github.com/pypa/pip", False),
-        # stackoverflow.*
-        ("https://stackoverflow.co/company", True),
-        ("https://meta.stackoverflow.co/", True),
-        ("https://stackoverflow.blog/inside-stack/", True),
-        ("https://api.stackexchange.com/2.3/questions", True),
-        # social anti-bot
-        ("https://x.com/someuser/status/123", True),
-        ("https://twitter.com/abc", True),
-        ("https://linkedin.com/in/matthewdeanmartin", True),
-        ("https://reddit.com/r/something", True),
-        # not blacklisted
-        ("https://example.org/about", False),
-        ("https://pypi.org/project/requests/", False),
+        "https://a.example/x/y",
+        "https://b.example/docs",
+        "https://b.example/docs/v1",
+        "https://b.example/doc",
+        "https://c1.example/",
+        "https://ccc.example/",
+        "https://d.example/abc",
+        "https://d.example/cde",
     ],
 )
-def test_is_blacklisted_matrix(url, expected):
-    assert is_blacklisted(url, CFG) is expected
+def test_mixed_patterns_agree_with_fnmatch_loop(url):
+    patterns = ["A.example ", "b.example/docs/*", "c?.example", "d.example/[ab]*"]
+    cfg = LogicConfig(max_outlinks=1, trusted_domains=[], blacklist_patterns=patterns)
+    assert is_blacklisted(url, cfg) is _fnmatch_reference(url, patterns)
 
 
-def test_queue_candidates_from_origin_respects_blacklist():
+def test_queue_candidates_from_origin_respects_blacklist(make_soup):
     origin = "https://origin.example/"
     html = """
     <a href="https://github.com/sponsors">GH sponsors</a>
     <a href="https://github.com/pypa/pip">pip</a>
     <link rel="me" href="https://joinmastodon.org/servers"/>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     out = queue_candidates_from_origin(
         current_url=origin,
         origin_url=origin,
@@ -112,7 +188,7 @@ def test_queue_candidates_from_origin_respects_blacklist():
     assert all("joinmastodon.org" not in u for u in out)
 
 
-def test_queue_candidates_from_pivot_respects_blacklist_and_origin_exclusion():
+def test_queue_candidates_from_pivot_respects_blacklist_and_origin_exclusion(make_soup):
     origin = "https://a.example/"
     pivot = "https://b.example/page"
     html = """
@@ -120,7 +196,7 @@ def test_queue_candidates_from_pivot_respects_blacklist_and_origin_exclusion():
     <a href="https://a.example/profile">goes back to origin host (should skip here)</a>
     <a href="https://c.example/page">neighbor ok</a>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     out = queue_candidates_from_pivot(
         current_url=pivot,
         pivot_url=pivot,
@@ -134,3 +210,16 @@ def test_queue_candidates_from_pivot_respects_blacklist_and_origin_exclusion():
     # ensure neither blacklisted nor origin-host link is present
     assert all("x.com" not in u for u in out)
     assert all("a.example" not in u for u in out)
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://github.com/pypa/pip", True),
+        ("https://github.com/sponsors/pypa", False),  # blacklisted
+        ("https://example.org/logo.png", False),  # asset extension
+        ("mailto:someone@example.org", False),  # not http(s)
+    ],
+)
+def test_is_crawlable_url(url, expected):
+    assert is_crawlable_url(url, CFG) is expected
@@ -0,0 +1,113 @@
+import asyncio
+
+from naive_backlink import browser_pool
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    def __init__(self, launches):
+        self.launches = launches
+        self.stopped = False
+        self.chromium = self
+
+    async def launch(self, **kwargs):
+        browser = FakeBrowser()
+        self.launches.append((browser, kwargs))
+        return browser
+
+    async def stop(self):
+        self.stopped = True
+
+
+def _install_fake(monkeypatch):
+    launches = []
+    started = []
+
+    class Starter:
+        async def start(self):
+            pw = FakePlaywright(launches)
+            started.append(pw)
+            return pw
+
+    monkeypatch.setattr(browser_pool, "async_playwright", Starter)
+    return launches, started
+
+
+def test_browser_is_launched_once_and_shared(monkeypatch):
+    launches, started = _install_fake(monkeypatch)
+
+    async def run():
+        b1, b2 = await asyncio.gather(
+            browser_pool.get_browser(), browser_pool.get_browser()
+        )
+        assert b1 is b2
+        await browser_pool.release_browser()
+        assert not b1.closed  # the other user still holds it
+        await browser_pool.release_browser()
+        return b1
+
+    browser = asyncio.run(run())
+    assert len(launches) == 1
+    assert launches[0][1]["headless"] is True
+    assert browser.closed
+    assert started[0].stopped
+
+
+def test_concurrent_crawls_do_not_close_the_browser_under_each_other(monkeypatch):
+    launches, _ = _install_fake(monkeypatch)
+
+    async def crawl(delay):
+        browser = await browser_pool.get_browser()
+        try:
+            await asyncio.sleep(delay)
+            assert not browser.closed  # the faster crawler is done by now
+        finally:
+            await browser_pool.release_browser()
+
+    async def run():
+        await asyncio.gather(crawl(0), crawl(0.01))
+
+    asyncio.run(run())
+    assert len(launches) == 1
+    assert launches[0][0].closed  # closed once the last crawler let go
+
+
+def test_held_reference_keeps_the_browser_warm_between_crawls(monkeypatch):
+    launches, _ = _install_fake(monkeypatch)
+
+    async def run():
+        await browser_pool.get_browser()  # the caller's own reference
+        for _ in range(3):
+            await browser_pool.get_browser()
+            await browser_pool.release_browser()
+        await browser_pool.release_browser()
+
+    asyncio.run(run())
+    assert len(launches) == 1
+    assert launches[0][0].closed
+
+
+def test_new_event_loop_forgets_the_stale_browser(monkeypatch, caplog):
+    launches, _ = _install_fake(monkeypatch)
+
+    first = asyncio.run(browser_pool.get_browser())
+    with caplog.at_level("WARNING", logger=browser_pool.__name__):
+        second = asyncio.run(browser_pool.get_browser())
+
+    assert first is not second
+    assert len(launches) == 2
+    assert "another event loop" in caplog.text
+    # Closing from yet another loop can't await the handles: just forget them.
+    asyncio.run(browser_pool.close_browser())
+    assert browser_pool._browser is None
+    assert browser_pool._users == 0
@@ -1,17 +1,38 @@
 import os
 import pathlib
 
+import pytest
+
 from naive_backlink.cache import CacheConfig, FileCache
 
 
-def test_set_and_get_html_ok_lowercases_headers_and_content_type(tmp_path):
-    cfg = CacheConfig(
-        enabled=True,
-        directory=str(tmp_path / "nb_cache"),
-        expire_seconds=30,
-        store_errors=False,
-    )
-    fc = FileCache(cfg, app_name="naive_backlink_test")
+@pytest.fixture
+def fc_factory(tmp_path):
+    """
+    Build FileCaches over one per-test directory (so diskcache lays out its
+    SQLite store once per test) and close them all at teardown.
+    """
+    made = []
+
+    def _make(**overrides):
+        settings = dict(
+            enabled=True,
+            directory=str(tmp_path / "nb_cache"),
+            expire_seconds=30,
+            store_errors=False,
+        )
+        settings.update(overrides)
+        fc = FileCache(CacheConfig(**settings), app_name="naive_backlink_test")
+        made.append(fc)
+        return fc
+
+    yield _make
+    for fc in made:
+        fc.close()
+
+
+def test_set_and_get_html_ok_lowercases_headers_and_content_type(fc_factory):
+    fc = fc_factory()
 
     url = "https://example.org/page"
     fc.set_html_ok(
@@ -35,14 +56,8 @@ def test_set_and_get_html_ok_lowercases_headers_and_content_type(tmp_path):
     assert "ok" in got["text"]
 
 
-def test_not_caching_errors_by_default(tmp_path):
-    cfg = CacheConfig(
-        enabled=True,
-        directory=str(tmp_path / "nb_cache"),
-        expire_seconds=30,
-        store_errors=False,
-    )
-    fc = FileCache(cfg)
+def test_not_caching_errors_by_default(fc_factory):
+    fc = fc_factory()
 
     url = "https://example.org/bad"
     # Should be ignored because status != 200 and store_errors = False
@@ -57,14 +72,8 @@ def test_not_caching_errors_by_default(tmp_path):
     assert fc.get(url) is None
 
 
-def test_caching_errors_when_enabled(tmp_path):
-    cfg = CacheConfig(
-        enabled=True,
-        directory=str(tmp_path / "nb_cache"),
-        expire_seconds=30,
-        store_errors=True,  # now we keep non-200
-    )
-    fc = FileCache(cfg)
+def test_caching_errors_when_enabled(fc_factory):
+    fc = fc_factory(store_errors=True)  # now we keep non-200
 
     url = "https://example.org/bad"
     fc.set_html_ok(
@@ -81,7 +90,7 @@ def test_caching_errors_when_enabled(tmp_path):
     assert got["text"] == "server down"
 
 
-def test_os_default_directory_uses_platformdirs(tmp_path, monkeypatch):
+def test_os_default_directory_uses_platformdirs(fc_factory, tmp_path, monkeypatch):
     # Monkeypatch the imported symbol used in cache.py
     from naive_backlink import cache as cache_mod
 
@@ -93,13 +102,7 @@ def test_os_default_directory_uses_platformdirs(tmp_path, monkeypatch):
 
     monkeypatch.setattr(cache_mod, "_user_cache_dir", fake_user_cache_dir, raising=True)
 
-    cfg = CacheConfig(
-        enabled=True,
-        directory="os-default",
-        expire_seconds=30,
-        store_errors=False,
-    )
-    fc = FileCache(cfg, app_name="naive_backlink_test")
+    fc = fc_factory(directory="os-default")
     # Force creation (constructor already calls it, but this is harmless)
     fc.create_cache_object()
 
@@ -109,14 +112,8 @@ def test_os_default_directory_uses_platformdirs(tmp_path, monkeypatch):
     assert cache_dir == target_dir
 
 
-def test_create_cache_object_idempotent(tmp_path):
-    cfg = CacheConfig(
-        enabled=True,
-        directory=str(tmp_path / "nb_cache"),
-        expire_seconds=30,
-        store_errors=False,
-    )
-    fc = FileCache(cfg)
+def test_create_cache_object_idempotent(fc_factory):
+    fc = fc_factory()
     first_dir = str(fc._cache.directory)  # type: ignore[attr-defined]
     # Call twice; should not recreate or change directory
     fc.create_cache_object()
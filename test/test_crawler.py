@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+from pytest_httpx import IteratorStream
+
+import naive_backlink.crawler as crawler_module
+from naive_backlink.config import DEFAULT_CONFIG
+from naive_backlink.crawler import Crawler, _domain_group
+from naive_backlink.frontier import VisitedSet
+from naive_backlink.link_logic import parse_links
+from naive_backlink.state import (
+    config_fingerprint,
+    load_crawl_state,
+    save_crawl_state,
+)
+
+ORIGIN = "https://origin.example/"
+
+ORIGIN_HTML = """
+<html><body>
+  <a href="https://pivot.example/me">profile</a>
+  <a href="https://github.com/sponsors/someone">blacklisted</a>
+  <a href="https://cdn.example/logo.png">asset</a>
+</body></html>
+"""
+
+PIVOT_HTML = """
+<html><body>
+  <a rel="me" href="https://origin.example">home</a>
+</body></html>
+"""
+
+
+def _config(**overrides):
+    cfg = dict(DEFAULT_CONFIG)
+    cfg["cache"] = {"enabled": False}
+    cfg.update(overrides)
+    return cfg
+
+
+async def _crawl(origin: str, config: dict, seed_urls=None) -> Crawler:
+    async with Crawler(origin, config, seed_urls=seed_urls) as crawler:
+        await crawler.crawl()
+    return crawler
+
+
+def _html(httpx_mock, url: str, body: str) -> None:
+    httpx_mock.add_response(
+        url=url, text=body, headers={"content-type": "text/html; charset=utf-8"}
+    )
+
+
+def test_crawl_finds_rel_me_backlink_and_skips_filtered_urls(httpx_mock):
+    _html(httpx_mock, "https://origin.example", ORIGIN_HTML)
+    _html(httpx_mock, "https://pivot.example/me", PIVOT_HTML)
+
+    crawler = asyncio.run(_crawl(ORIGIN, _config()))
+    evidence, errors = crawler.get_results()
+
+    assert errors == []
+    assert [ev.target.url for ev in evidence] == ["https://pivot.example/me"]
+    assert evidence[0].classification == "strong"
+    # Blacklisted and asset URLs never reached the network (pytest-httpx would
+    # fail the test on an unexpected request).
+    requested = {str(r.url) for r in httpx_mock.get_requests()}
+    assert requested == {"https://origin.example", "https://pivot.example/me"}
+
+
+def test_seed_urls_are_filtered_before_enqueue(httpx_mock):
+    _html(httpx_mock, "https://pivot.example/me", PIVOT_HTML)
+
+    crawler = asyncio.run(
+        _crawl(
+            ORIGIN,
+            _config(),
+            seed_urls=[
+                "https://pivot.example/me",
+                "https://x.com/blacklisted",
+                "mailto:someone@example.com",
+            ],
+        )
+    )
+    evidence, _ = crawler.get_results()
+    assert [ev.target.url for ev in evidence] == ["https://pivot.example/me"]
+
+
+@pytest.mark.parametrize("status", [404, 500])
+def test_http_errors_are_recorded(httpx_mock, status):
+    httpx_mock.add_response(url="https://origin.example", status_code=status)
+
+    crawler = asyncio.run(_crawl(ORIGIN, _config()))
+    evidence, errors = crawler.get_results()
+    assert evidence == []
+    assert len(errors) == 1
+    assert str(status) in errors[0]
+
+
+def test_oversized_page_rejected_by_content_length(httpx_mock):
+    httpx_mock.add_response(
+        url="https://origin.example",
+        content=b"<a href='https://pivot.example/me'>x</a>" * 100,
+        headers={"content-type": "text/html"},
+    )
+
+    crawler = asyncio.run(_crawl(ORIGIN, _config(max_content_bytes=1000)))
+    evidence, errors = crawler.get_results()
+    assert evidence == []
+    assert errors == ["Content too large at https://origin.example (4000 > 1000)"]
+
+
+def test_oversized_page_cut_off_while_streaming(httpx_mock):
+    # No Content-Length: the cap is enforced while reading, so the third chunk
+    # is never read.
+    httpx_mock.add_response(
+        url="https://origin.example",
+        stream=IteratorStream([b"<html>" + b" " * 600, b" " * 600, b" " * 600]),
+        headers={"content-type": "text/html"},
+    )
+
+    crawler = asyncio.run(_crawl(ORIGIN, _config(max_content_bytes=1000)))
+    _, errors = crawler.get_results()
+    assert errors == ["Content too large at https://origin.example (1206 > 1000)"]
+
+
+@pytest.mark.parametrize("cap, expected_peak", [(1, 1), (16, 3)])
+def test_cross_domain_fetches_overlap_up_to_global_cap(httpx_mock, cap, expected_peak):
+    pivots = [f"https://p{i}.example/me" for i in range(3)]
+    _html(
+        httpx_mock,
+        "https://origin.example",
+        "".join(f'<a href="{p}">p</a>' for p in pivots),
+    )
+    in_flight = 0
+    peak = 0
+
+    async def slow_pivot(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(
+            200, text=PIVOT_HTML, headers={"content-type": "text/html"}
+        )
+
+    for p in pivots:
+        httpx_mock.add_callback(slow_pivot, url=p)
+
+    crawler = asyncio.run(_crawl(ORIGIN, _config(max_global_concurrency=cap)))
+    evidence, _ = crawler.get_results()
+    assert len(evidence) == 3
+    assert peak == expected_peak
+
+
+def test_neighbor_reachable_from_two_pivots_is_fetched_once(httpx_mock):
+    _html(
+        httpx_mock,
+        "https://origin.example",
+        '<a href="https://b1.example/me">b1</a><a href="https://b2.example/me">b2</a>',
+    )
+    pivot_html = (
+        '<a href="https://origin.example">home</a>'
+        '<a href="https://c.example/shared">shared</a>'
+    )
+    _html(httpx_mock, "https://b1.example/me", pivot_html)
+    _html(httpx_mock, "https://b2.example/me", pivot_html)
+    # Registered once: a second request for it would fail the test.
+    _html(httpx_mock, "https://c.example/shared", "<p>no links</p>")
+
+    crawler = asyncio.run(_crawl(ORIGIN, _config()))
+    evidence, errors = crawler.get_results()
+
+    assert errors == []
+    assert sorted(ev.target.url for ev in evidence) == [
+        "https://b1.example/me",
+        "https://b2.example/me",
+    ]
+    assert not crawler.queued_urls
+    # Derived from `parent`: C is listed once, under the pivot that queued it first.
+    pivot = crawler.parent["https://c.example/shared"]
+    assert pivot in {"https://b1.example/me", "https://b2.example/me"}
+    assert crawler.pivot_outlinked == {pivot: {"https://c.example/shared"}}
+
+
+def test_bloom_visited_set_gives_same_results(httpx_mock):
+    _html(httpx_mock, "https://origin.example", ORIGIN_HTML)
+    _html(httpx_mock, "https://pivot.example/me", PIVOT_HTML)
+
+    crawler = asyncio.run(_crawl(ORIGIN, _config(use_bloom=True, expected_urls=1000)))
+    evidence, errors = crawler.get_results()
+
+    assert isinstance(crawler.visited_urls, VisitedSet)
+    assert errors == []
+    assert [ev.target.url for ev in evidence] == ["https://pivot.example/me"]
+
+
+def test_client_honors_env_proxies(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+
+    async def transports():
+        async with Crawler(ORIGIN, _config()) as crawler:
+            client = crawler._client
+            return client._transport_for_url(httpx.URL(ORIGIN)), client._transport
+
+    proxied, default = asyncio.run(transports())
+    assert proxied is not default
+
+
+@pytest.mark.parametrize(
+    "url, use_registrable, key",
+    [
+        ("https://a.Example.co.uk:8443/x", False, "a.example.co.uk"),
+        ("https://a.example.co.uk/x", True, "example.co.uk"),
+        ("https://b.example.co.uk/y", True, "example.co.uk"),
+        ("http://localhost:8000/", True, "localhost"),
+        ("mailto:x@example.com", True, ""),
+    ],
+)
+def test_domain_group(url, use_registrable, key):
+    pytest.importorskip("tldextract")
+    assert _domain_group(url, use_registrable) == key
+
+
+def test_pages_are_parsed_off_the_event_loop_thread(httpx_mock, monkeypatch):
+    _html(httpx_mock, "https://origin.example", ORIGIN_HTML)
+    _html(httpx_mock, "https://pivot.example/me", PIVOT_HTML)
+    parse_threads = []
+
+    def recording_parse(markup):
+        parse_threads.append(threading.get_ident())
+        return parse_links(markup)
+
+    monkeypatch.setattr(crawler_module, "parse_links", recording_parse)
+    crawler = asyncio.run(_crawl(ORIGIN, _config()))
+
+    assert len(crawler.get_results()[0]) == 1
+    assert len(parse_threads) == 2
+    assert threading.get_ident() not in parse_threads
+
+
+def test_state_path_resumes_without_refetching(httpx_mock, tmp_path):
+    state = tmp_path / "state.json"
+    _html(httpx_mock, "https://origin.example", ORIGIN_HTML)
+    _html(httpx_mock, "https://pivot.example/me", PIVOT_HTML)
+
+    first = asyncio.run(_crawl(ORIGIN, _config(state_path=str(state))))
+    assert state.exists()
+
+    # Nothing new is registered: any request in the second run fails the test.
+    second = asyncio.run(_crawl(ORIGIN, _config(state_path=str(state))))
+    assert second.get_results() == first.get_results()
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_state_path_fetches_only_pending_urls(httpx_mock, tmp_path):
+    state = tmp_path / "state.json"
+    config = _config(state_path=str(state))
+    save_crawl_state(
+        state,
+        "https://origin.example",
+        {
+            "visited": {"https://origin.example"},
+            "queued": [("https://pivot.example/me", 1)],
+            "parent": {},
+            "pivots": set(),
+            "evidence": [],
+            "evidence_producing": set(),
+            "errors": [],
+        },
+        config,
+    )
+    _html(httpx_mock, "https://pivot.example/me", PIVOT_HTML)
+
+    crawler = asyncio.run(_crawl(ORIGIN, config))
+    evidence, _ = crawler.get_results()
+    assert [ev.target.url for ev in evidence] == ["https://pivot.example/me"]
+    assert load_crawl_state(state, "https://origin.example", config)["queued"] == []
+    # State for another origin is ignored.
+    assert load_crawl_state(state, "https://elsewhere.example", config) is None
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"max_hops": 1},
+        {"max_outlinks": 5},
+        {"blacklist": ["*.pivot.example/*"]},
+        {"trusted": ["pivot.example"]},
+    ],
+)
+def test_state_saved_under_other_crawl_settings_is_ignored(
+    httpx_mock, tmp_path, change
+):
+    state = tmp_path / "state.json"
+    _html(httpx_mock, "https://origin.example", ORIGIN_HTML)
+    _html(httpx_mock, "https://pivot.example/me", PIVOT_HTML)
+    asyncio.run(_crawl(ORIGIN, _config(state_path=str(state))))
+    assert len(httpx_mock.get_requests()) == 2
+
+    changed = _config(state_path=str(state), **change)
+    assert load_crawl_state(state, "https://origin.example", changed) is None
+
+    async def restored():
+        async with Crawler(ORIGIN, changed) as crawler:
+            return set(crawler.visited_urls), crawler.evidence[:]
+
+    # A fresh start: nothing visited, no evidence carried over.
+    assert asyncio.run(restored()) == (set(), [])
+
+
+def test_config_fingerprint_ignores_pattern_order_and_unrelated_keys():
+    base = _config(blacklist=["a.example/*", "b.example/*"])
+    assert config_fingerprint(base) == config_fingerprint(
+        _config(blacklist=["b.example/*", "a.example/*"], timeout=99.0)
+    )
+    assert config_fingerprint(base) != config_fingerprint(
+        _config(blacklist=["a.example/*"])
+    )
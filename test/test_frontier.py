@@ -0,0 +1,85 @@
+import pytest
+
+from naive_backlink.frontier import (
+    BloomFilter,
+    HopQueue,
+    ScalableBloomFilter,
+    VisitedSet,
+)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bf = BloomFilter(capacity=1000, error_rate=1e-3)
+    urls = [f"https://site{i}.example/p" for i in range(1000)]
+    for u in urls:
+        bf.add(u)
+    assert all(u in bf for u in urls)
+    assert len(bf) == 1000
+
+
+def test_bloom_filter_false_positive_rate_is_near_target():
+    bf = BloomFilter(capacity=2000, error_rate=1e-2)
+    for i in range(2000):
+        bf.add(f"https://in.example/{i}")
+    false_hits = sum(f"https://out.example/{i}" in bf for i in range(5000))
+    assert false_hits < 5000 * 0.03
+
+
+@pytest.mark.parametrize("capacity, rate", [(0, 0.01), (10, 0.0), (10, 1.0)])
+def test_bloom_filter_rejects_bad_sizing(capacity, rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, rate)
+
+
+def test_visited_set_behaves_like_a_set_for_membership():
+    vs = VisitedSet(expected_urls=100, recent_size=2)
+    for u in ["https://a.example", "https://b.example", "https://c.example"]:
+        vs.add(u)
+    vs.add("https://a.example")  # re-adding does not change the count
+    assert "https://a.example" in vs  # evicted from the LRU, still in the filter
+    assert "https://c.example" in vs
+    assert "https://z.example" not in vs
+    assert len(vs) == 3
+
+
+def test_scalable_bloom_filter_grows_without_false_negatives():
+    sbf = ScalableBloomFilter(initial_capacity=100, error_rate=1e-2)
+    urls = [f"https://site{i}.example/p" for i in range(1000)]
+    for u in urls:
+        sbf.add(u)
+    assert all(u in sbf for u in urls)
+    assert len(sbf) == 1000
+    # 100 + 200 + 400 + 800: four filters chained to hold 1000 items.
+    assert sbf.capacity == 1500
+    false_hits = sum(f"https://out.example/{i}" in sbf for i in range(5000))
+    assert false_hits < 5000 * 0.02
+
+
+def test_visited_set_without_size_uses_scalable_filter():
+    vs = VisitedSet(recent_size=1)
+    for i in range(50):
+        vs.add(f"https://a.example/{i}")
+    assert isinstance(vs._bloom, ScalableBloomFilter)
+    assert "https://a.example/0" in vs
+    assert len(vs) == 50
+
+
+def test_hop_queue_pops_lowest_hop_first_fifo_within_hop():
+    q = HopQueue()
+    q.append(("https://b.example/2", 2))
+    q.append(("https://a.example/1", 1))
+    q.append(("https://c.example/2", 2))
+    q.append(("https://d.example/1", 1))
+    assert len(q) == 4
+    assert list(q) == [
+        ("https://a.example/1", 1),
+        ("https://d.example/1", 1),
+        ("https://b.example/2", 2),
+        ("https://c.example/2", 2),
+    ]
+    popped = [q.popleft() for _ in range(4)]
+    assert [hops for _, hops in popped] == [1, 1, 2, 2]
+    assert popped[0][0] == "https://a.example/1"
+    assert not q
+    with pytest.raises(IndexError):
+        q.popleft()
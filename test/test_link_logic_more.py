@@ -1,24 +1,44 @@
 # tests/test_link_logic.py
 from __future__ import annotations
 
+import os
+from urllib.parse import urljoin
+
 import pytest
 from bs4 import BeautifulSoup
 
+from naive_backlink import link_logic
 from naive_backlink.link_logic import _netloc  # private helper
 from naive_backlink.link_logic import (  # private helper; exercised for policy behavior; private but deterministic enough for fallback tests
     LogicConfig,
+    _as_set,
+    _is_asset_rel,
     _is_same_domain_blocked,
+    _path_ext,
     _registrable_domain_or,
+    _rel_list,
+    _resolve_href,
     classify_backlink,
+    clear_url_caches,
     detect_backlink_element,
     extract_href_elements,
+    index_links,
     is_fetchable_url,
+    iter_href_elements,
     make_evidence,
     normalize_url,
+    origin_info,
+    parse_html,
+    parse_links,
+    parse_url,
+    pivot_neighbors,
     queue_candidates_from_origin,
 )
 from naive_backlink.models import LinkDetails, URLContext
 
+# Same worker as test_blacklist.py under `--dist loadgroup` (shared URL caches).
+pytestmark = pytest.mark.xdist_group("link_logic")
+
 # ---------- normalize_url / scheme/host handling ----------
 
 
@@ -36,6 +56,105 @@ def test_normalize_url_basic(inp, exp):
     assert normalize_url(inp) == exp
 
 
+@pytest.mark.parametrize(
+    "inp, exp",
+    [
+        ("https://example.com:443/a", "https://example.com/a"),
+        ("http://example.com:80/a", "http://example.com/a"),
+        ("http://example.com:443/a", "http://example.com:443/a"),
+        ("https://user@Example.com:443/", "https://user@example.com"),
+        ("https://[::1]:443/a", "https://[::1]/a"),
+        ("https://[::1]:8443/a", "https://[::1]:8443/a"),
+        ("https://Bücher.example/", "https://xn--bcher-kva.example"),
+        ("https://example.com/%7euser/a%2fb", "https://example.com/~user/a%2Fb"),
+        ("https://example.com/p?b=2&a=1", "https://example.com/p?a=1&b=2"),
+        (
+            "https://example.com/p?utm_source=x&id=3&fbclid=y&gclid=z&mc_cid=w",
+            "https://example.com/p?id=3",
+        ),
+        ("https://example.com/p?utm_source=x", "https://example.com/p"),
+        ("https://example.com/p?fb=1&q=a+b", "https://example.com/p?fb=1&q=a+b"),
+    ],
+)
+def test_normalize_url_canonicalizes_duplicates(inp, exp):
+    assert normalize_url(inp) == exp
+
+
+@pytest.mark.parametrize(
+    "base",
+    [
+        "https://Site.example:8443/dir/page.html?q=1#f",
+        "https://user@site.example/",
+        "not-a-url",
+    ],
+)
+@pytest.mark.parametrize(
+    "href",
+    [
+        "/about",
+        "/a/b?x=1#top",
+        "/a/../b",
+        "/./c",
+        "//other.example/x",
+        "/with space",
+        "/tab\there",
+        "relative/page",
+        "?only=query",
+        "#frag",
+        "https://abs.example/",
+    ],
+)
+def test_resolve_href_matches_urljoin(base, href):
+    assert _resolve_href(base, href) == urljoin(base, href)
+
+
+def test_parse_url_fields_agree_with_string_helpers():
+    pu = parse_url("HTTPS://Sub.Example.com/Docs/Logo.PNG/?q=1#frag")
+    assert pu.normalized == normalize_url(
+        "HTTPS://Sub.Example.com/Docs/Logo.PNG/?q=1#frag"
+    )
+    assert pu.scheme == "https"
+    assert pu.netloc == "sub.example.com"
+    assert pu.path == "/Docs/Logo.PNG"
+    assert pu.hostpath == "sub.example.com/docs/logo.png"
+    assert pu.ext == ".png"
+    # predicates accept either form and agree
+    assert is_fetchable_url(pu) is is_fetchable_url(pu.normalized) is True
+    assert _netloc(pu) == _netloc(pu.normalized)
+    assert parse_url("https://example.com/").hostpath == "example.com"
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "",
+        "/",
+        "/about",
+        "/logo.PNG",
+        "/a.b/c",
+        "/a.b/c.tar.gz",
+        "/.well-known",
+        "/dir/.env",
+        "/dir.v2/",
+        "/x..png",
+    ],
+)
+def test_path_ext_matches_os_path_splitext(path):
+    assert _path_ext(path) == os.path.splitext(path.lower())[1]
+
+
+def test_normalize_url_and_netloc_share_the_parse_cache():
+    clear_url_caches()
+    url = "HTTPS://Cache.Example/Page/"
+    normalize_url(url)
+    assert parse_url.cache_info().misses == 1
+    assert normalize_url(url) == "https://cache.example/Page"
+    assert _netloc(url) == "cache.example"
+    assert parse_url.cache_info().misses == 1  # both lookups were cache hits
+    clear_url_caches()
+    assert parse_url.cache_info().currsize == 0
+
+
 def test_normalize_url_malformed_returns_input():
     # urlparse will accept odd inputs; this checks we don't crash
     bad = "::::not_a_url###"
@@ -125,10 +244,27 @@ def test__is_same_domain_blocked_registrable_domain(monkeypatch):
     assert _is_same_domain_blocked("news.bbc.co.uk", "example.co.uk", cfg) is False
 
 
+def test_origin_info_is_cached_and_agrees_with_plain_host():
+    info = origin_info("https://Example.co.uk/home/")
+    assert info is origin_info("https://Example.co.uk/home/")
+    assert (info.url, info.host) == ("https://example.co.uk/home", "example.co.uk")
+    for registrable in (False, True):
+        cfg = LogicConfig(
+            max_outlinks=10,
+            trusted_domains=[],
+            same_domain_policy="no-self-domain-or-subdomain",
+            use_registrable_domain=registrable,
+        )
+        for cand in ("example.co.uk", "a.example.co.uk", "other.co.uk"):
+            assert _is_same_domain_blocked(cand, info, cfg) is _is_same_domain_blocked(
+                cand, "example.co.uk", cfg
+            )
+
+
 # ---------- extract_href_elements ----------
 
 
-def test_extract_href_elements_includes_a_and_link_only_with_href():
+def test_extract_href_elements_includes_a_and_link_only_with_href(make_soup):
     html = """
     <html><head>
       <link rel="me" href="https://example.com/u/me">
@@ -140,16 +276,85 @@ def test_extract_href_elements_includes_a_and_link_only_with_href():
       <div href="/not-a-link">x</div>
     </body></html>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     els = extract_href_elements(soup)
     hrefs = [e.get("href") for e in els]
     assert hrefs == ["/one", "https://example.com/u/me", "/css/x.css"]
 
 
+def test_iter_href_elements_walks_the_tree_once(make_soup, monkeypatch):
+    soup = make_soup(
+        '<link href="/head.css"><a href="/one">1</a><link href="/x"><a href="/two">2</a>'
+    )
+    walks = []
+    descendants = BeautifulSoup.descendants
+
+    def counting(self):
+        walks.append(self)
+        return descendants.fget(self)
+
+    monkeypatch.setattr(BeautifulSoup, "descendants", property(counting))
+    hrefs = [e.get("href") for e in iter_href_elements(soup)]
+    assert hrefs == ["/one", "/two", "/head.css", "/x"]  # <a> first, then <link>
+    assert len(walks) == 1
+
+
+def test_parse_html_bytes_honors_meta_charset():
+    html = '<meta charset="iso-8859-1"><a href="/caf\xe9">caf\xe9</a>'.encode(
+        "iso-8859-1"
+    )
+    els = extract_href_elements(parse_html(html))
+    assert [e.get("href") for e in els] == ["/caf\u00e9"]
+
+
+def test_parse_html_falls_back_when_parser_is_unavailable(monkeypatch):
+    monkeypatch.setattr(link_logic, "HTML_PARSER", "no-such-parser")
+    soup = parse_html('<a href="https://x.example/">x</a>')
+    assert [a["href"] for a in soup.find_all("a")] == ["https://x.example/"]
+
+
+def test_parse_html_keeps_only_link_elements_with_href():
+    html = """
+    <html><head><title>t</title><script>var x;</script>
+      <link rel="me" href="https://example.com/u/me"><link rel="preload">
+    </head><body><p>text <a href="/one">one <b>bold</b></a></p><a>nope</a></body></html>
+    """
+    soup = parse_html(html)
+    top_level = {t.name for t in soup.find_all(True, recursive=False)}
+    assert top_level == {"a", "link"}
+    assert soup.find("a").get_text() == "one bold"  # children of kept tags survive
+    assert [e.get("href") for e in extract_href_elements(soup)] == [
+        "/one",
+        "https://example.com/u/me",
+    ]
+
+
+def test_parse_links_returns_plain_elements_usable_like_tags():
+    html = """
+    <link rel="ME Stylesheet" href="https://example.com/u/me">
+    <a href="/one" rel="nofollow">one</a><a href="/two">two</a>
+    """
+    tags = extract_href_elements(parse_html(html))
+    links = parse_links(html)
+    assert [el.get("href") for el in links] == [t.get("href") for t in tags]
+    assert [str(el) for el in links] == [str(t) for t in tags]
+    assert [el.name for el in links] == ["a", "a", "link"]
+    assert links[0].get("rel") == ["nofollow"]
+    assert links[1].get("rel") is None
+    assert _is_asset_rel(links[2])  # rel is lowercased like _rel_list
+    assert links[2].get("class", "x") == "x"
+
+    origin = "https://example.com/u/me"
+    cfg = LogicConfig(max_outlinks=10, trusted_domains=[])
+    ev_tag = make_evidence("https://site.example", origin, 1, tags[2], cfg, 1)
+    ev_el = make_evidence("https://site.example", origin, 1, links[2], cfg, 1)
+    assert ev_el == ev_tag
+
+
 # ---------- detect_backlink_element ----------
 
 
-def test_detect_backlink_element_matches_resolved_and_normalized():
+def test_detect_backlink_element_matches_resolved_and_normalized(make_soup):
     current = "https://site.example/path/page.html"
     origin = "https://origin.example/"
     html = """
@@ -157,7 +362,7 @@ def test_detect_backlink_element_matches_resolved_and_normalized():
     <a href="//origin.example">proto-relative host</a>
     <a href="https://ORIGIN.example">exact strong candidate</a>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     tag = detect_backlink_element(
         current_url=current, origin_url=origin, elements=soup.find_all(["a", "link"])
     )
@@ -165,21 +370,65 @@ def test_detect_backlink_element_matches_resolved_and_normalized():
     assert tag.get("href") in {"//origin.example", "https://ORIGIN.example"}
 
 
-def test_detect_backlink_element_ignores_non_fetchable():
+def test_detect_backlink_element_ignores_non_fetchable(make_soup):
     current = "https://site.example/"
     origin = "https://origin.example/"
     html = """
       <a href="mailto:admin@origin.example">no</a>
       <a href="javascript:void(0)">no</a>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     assert detect_backlink_element(current, origin, soup.find_all("a")) is None
 
 
+def test_index_links_agrees_with_detect_backlink_element(make_soup):
+    current = "https://site.example/path/page.html"
+    origin = "https://origin.example/"
+    html = """
+    <a href="mailto:someone@origin.example">not real</a>
+    <a href="/elsewhere">relative, wrong host</a>
+    <a href="https://ORIGIN.example/#top">fragment and case differ</a>
+    <a href="https://origin.example">second link to origin</a>
+    """
+    elements = make_soup(html).find_all("a")
+    links = index_links(current, elements)
+    tag = links.get(normalize_url(origin))
+    assert tag is not None
+    assert tag is detect_backlink_element(current, origin, elements)
+    assert tag is elements[2]  # first match wins
+    assert "https://site.example/elsewhere" in links
+    # non-fetchable targets are left out
+    assert not any(k.startswith("mailto:") for k in links)
+
+
+def test_index_links_with_wanted_stops_once_all_targets_are_found(make_soup):
+    current = "https://site.example/"
+    html = """
+    <a href="https://origin.example/">origin</a>
+    <a href="https://other.example/">not wanted</a>
+    <a href="https://pivot.example/me">pivot</a>
+    <a href="https://never.example/">after the last hit</a>
+    """
+    soup = make_soup(html)
+    pulled = []
+
+    def tracking():
+        for el in iter_href_elements(soup):
+            pulled.append(el.get("href"))
+            yield el
+
+    wanted = {"https://origin.example", "https://pivot.example/me"}
+    links = index_links(current, tracking(), wanted)
+    assert set(links) == wanted
+    assert "https://never.example/" not in pulled
+
+
 # ---------- queue_candidates_from_origin (no network) ----------
 
 
-def test_queue_candidates_from_origin_skips_non_fetchable_and_duplicates_and_visited():
+def test_queue_candidates_from_origin_skips_non_fetchable_and_duplicates_and_visited(
+    make_soup,
+):
     origin = "https://origin.example/"
     current = origin
     html = """
@@ -189,7 +438,7 @@ def test_queue_candidates_from_origin_skips_non_fetchable_and_duplicates_and_vis
       <a href="/a">dup a</a>
       <link rel="me" href="https://trusted.example/u/me">profile</link>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     cfg = LogicConfig(
         max_outlinks=10,
         trusted_domains=[],
@@ -215,14 +464,14 @@ def test_queue_candidates_from_origin_skips_non_fetchable_and_duplicates_and_vis
     ]
 
 
-def test_queue_candidates_from_origin_respects_max_outlinks():
+def test_queue_candidates_from_origin_respects_max_outlinks(make_soup):
     origin = "https://o.example/"
     current = origin
     html = """
       <a href="/a1">a1</a><a href="/a2">a2</a><a href="/a3">a3</a>
       <a href="/a4">a4</a><a href="/a5">a5</a>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     cfg = LogicConfig(
         max_outlinks=3,
         trusted_domains=[],
@@ -245,7 +494,75 @@ def test_queue_candidates_from_origin_respects_max_outlinks():
     ]
 
 
-def test_queue_candidates_from_origin_policy_blocks_self_and_subdomains():
+def test_queue_candidates_skip_known_urls_before_pattern_checks(monkeypatch, make_soup):
+    origin = "https://o.example/"
+    html = '<a href="https://x.example/seen">s</a><a href="https://x.example/q">q</a>'
+    checked = []
+    monkeypatch.setattr(
+        link_logic, "is_blacklisted", lambda pu, cfg: checked.append(pu) or False
+    )
+    cfg = LogicConfig(max_outlinks=10, trusted_domains=[])
+    out = queue_candidates_from_origin(
+        current_url=origin,
+        origin_url=origin,
+        elements=make_soup(html).find_all("a"),
+        cfg=cfg,
+        already_queued={"https://x.example/q"},
+        visited={"https://x.example/seen"},
+    )
+    assert out == []
+    assert checked == []
+
+
+def test_queue_candidates_accept_lists_or_sets_for_membership(make_soup):
+    origin = "https://o.example/"
+    html = "".join(f'<a href="https://x{i}.example/">x</a>' for i in range(6))
+    elements = make_soup(html).find_all("a")
+    cfg = LogicConfig(max_outlinks=10, trusted_domains=[])
+    queued = [f"https://x{i}.example" for i in (0, 2)]
+    visited = [f"https://x{i}.example" for i in (1, 3)]
+
+    from_lists = queue_candidates_from_origin(
+        origin, origin, elements, cfg, already_queued=queued, visited=visited
+    )
+    from_sets = queue_candidates_from_origin(
+        origin, origin, elements, cfg, already_queued=set(queued), visited=set(visited)
+    )
+    assert from_lists == from_sets == ["https://x4.example", "https://x5.example"]
+    # Sets are used as-is (O(1) lookups, no per-call copy); lists are hashed once.
+    live = set(queued)
+    assert _as_set(live) is live
+    assert _as_set(queued) == live
+
+
+def test_queue_candidates_from_origin_dedups_repeated_hrefs_after_asset_rel(make_soup):
+    origin = "https://o.example/"
+    html = """
+      <link rel="icon" href="https://x.example/page">
+      <a href="https://x.example/page">menu</a>
+      <a href="https://x.example/page">footer</a>
+      <a href="https://x.example/page/">same page, different href</a>
+    """
+    soup = make_soup(html)
+    cfg = LogicConfig(
+        max_outlinks=10,
+        trusted_domains=[],
+        same_domain_policy="follow",
+        use_registrable_domain=False,
+    )
+    out = queue_candidates_from_origin(
+        current_url=origin,
+        origin_url=origin,
+        elements=soup.find_all(["link", "a"]),
+        cfg=cfg,
+        already_queued=set(),
+        visited=set(),
+    )
+    # The asset <link> does not hide the anchor with the same href.
+    assert out == ["https://x.example/page"]
+
+
+def test_queue_candidates_from_origin_policy_blocks_self_and_subdomains(make_soup):
     origin = "https://origin.example/"
     current = origin
     html = """
@@ -253,7 +570,7 @@ def test_queue_candidates_from_origin_policy_blocks_self_and_subdomains():
       <a href="https://sub.origin.example/child">child</a>
       <a href="https://other.example/x">other</a>
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     cfg = LogicConfig(
         max_outlinks=10,
         trusted_domains=[],
@@ -282,7 +599,7 @@ def test_classify_backlink_rel_me_and_trusted_surface():
     tag = _soup_tag('<a rel="me nofollow" href="https://origin.example/">me</a>')
     cfg = LogicConfig(
         max_outlinks=10,
-        trusted_domains=["trusted.example"],  # substring match on source host
+        trusted_domains=["trusted.example"],  # suffix match on source host
         same_domain_policy="follow",
         use_registrable_domain=False,
     )
@@ -294,6 +611,30 @@ def test_classify_backlink_rel_me_and_trusted_surface():
     assert trusted_surface is True
 
 
+def test_rel_list_splits_a_plain_string_rel():
+    tag = _soup_tag('<a href="https://origin.example/">me</a>')
+    tag["rel"] = "ME  Nofollow"  # a str, not bs4's usual list
+    assert _rel_list(tag) == ["me", "nofollow"]
+
+
+@pytest.mark.parametrize(
+    "host, trusted",
+    [
+        ("trusted.example", True),
+        ("sub.trusted.example:8443", True),
+        ("trusted.example.evil", False),  # substring, but not a suffix
+        ("nottrusted.example", False),  # suffix, but not on a label boundary
+        ("wild.example", True),  # via "*.wild.example"
+        ("other.example", False),
+    ],
+)
+def test_logic_config_is_trusted_host(host, trusted):
+    cfg = LogicConfig(
+        max_outlinks=1, trusted_domains=[" Trusted.Example ", "*.wild.example", ""]
+    )
+    assert cfg.is_trusted_host(host) is trusted
+
+
 def test_make_evidence_fields_populated():
     tag = _soup_tag('<link rel="me" href="https://origin.example/">')
     cfg = LogicConfig(
@@ -317,3 +658,16 @@ def test_make_evidence_fields_populated():
     assert isinstance(ev.link, LinkDetails)
     assert "me" in (ev.link.rel or [])
     assert ev.hops == 2
+
+
+def test_pivot_neighbors_groups_by_first_pivot():
+    parent = {
+        "https://c1.example": "https://b1.example",
+        "https://c2.example": "https://b1.example",
+        "https://c3.example": "https://b2.example",
+    }
+    assert pivot_neighbors(parent) == {
+        "https://b1.example": {"https://c1.example", "https://c2.example"},
+        "https://b2.example": {"https://c3.example"},
+    }
+    assert pivot_neighbors({}) == {}
@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+import naive_backlink.playwright_crawler as pw_module
+from naive_backlink.config import DEFAULT_CONFIG
+from naive_backlink.playwright_crawler import Crawler
+
+ORIGIN = "https://origin.example/"
+
+SITE = {
+    "https://origin.example": (
+        '<a href="https://p1.example/me">1</a>'
+        '<a href="https://p2.example/me">2</a>'
+        '<a href="https://p3.example/me">3</a>'
+    ),
+    "https://p1.example/me": '<a rel="me" href="https://origin.example">home</a>',
+    "https://p2.example/me": '<a href="https://origin.example">home</a>',
+    "https://p3.example/me": "<p>no backlink</p>",
+}
+
+
+class FakeResponse:
+    status = 200
+    headers = {"content-type": "text/html"}
+
+
+class FakePage:
+    """Serves SITE with a small delay so concurrent pages overlap."""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.url = ""
+        self._html = ""
+
+    async def goto(self, url, **kwargs):
+        self.stats["wait_until"] = kwargs.get("wait_until")
+        self.stats["in_flight"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["in_flight"])
+        await asyncio.sleep(0.02)
+        self.stats["in_flight"] -= 1
+        self.stats["visits"].append(url)
+        self.url = url
+        self._html = SITE.get(url.rstrip("/"), "")
+        return FakeResponse()
+
+    async def wait_for_load_state(self, state, timeout=None):
+        self.stats["load_waits"] += 1
+        raise PlaywrightTimeoutError("still loading")
+
+    async def content(self):
+        return self._html
+
+
+class FakeContext:
+    def __init__(self, stats):
+        self.stats = stats
+        self.closed = False
+
+    async def new_page(self):
+        self.stats["pages"] += 1
+        return FakePage(self.stats)
+
+    async def route(self, pattern, handler):
+        self.stats["route"] = (pattern, handler)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = {"in_flight": 0, "peak": 0, "pages": 0, "visits": [], "load_waits": 0}
+
+    class FakeBrowser:
+        async def new_context(self, **kwargs):
+            stats["user_agent"] = kwargs.get("user_agent")
+            stats["service_workers"] = kwargs.get("service_workers")
+            stats["context"] = FakeContext(stats)
+            return stats["context"]
+
+    async def fake_get_browser():
+        stats["browser_refs"] = stats.get("browser_refs", 0) + 1
+        return FakeBrowser()
+
+    async def fake_release_browser():
+        stats["browser_refs"] -= 1
+
+    monkeypatch.setattr(pw_module, "get_browser", fake_get_browser)
+    monkeypatch.setattr(pw_module, "release_browser", fake_release_browser)
+    return stats
+
+
+def _run(config):
+    async def go():
+        async with Crawler(ORIGIN, config) as crawler:
+            await crawler.crawl()
+        return crawler
+
+    return asyncio.run(go())
+
+
+def _config(**overrides):
+    cfg = dict(DEFAULT_CONFIG)
+    cfg.update(overrides)
+    return cfg
+
+
+@pytest.mark.parametrize("concurrency, expected_peak", [(1, 1), (4, 3)])
+def test_pages_are_rendered_concurrently(stats, concurrency, expected_peak):
+    crawler = _run(_config(playwright_concurrency=concurrency))
+    evidence, errors = crawler.get_results()
+
+    assert errors == []
+    assert sorted((ev.target.url, ev.classification) for ev in evidence) == [
+        ("https://p1.example/me", "strong"),
+        ("https://p2.example/me", "weak"),
+    ]
+    assert stats["pages"] == concurrency
+    assert stats["peak"] == expected_peak
+    assert sorted(stats["visits"]) == sorted(SITE)
+    assert stats["context"].closed
+    assert stats["browser_refs"] == 0  # the shared browser was released
+    assert crawler.queued_urls == set()
+    assert stats["route"] == ("**/*", pw_module._block_subresources)
+    assert stats["service_workers"] == "block"
+    assert stats["wait_until"] == "domcontentloaded"
+    assert stats["load_waits"] == 0
+
+
+def test_quick_nav_parses_partial_dom_after_grace_timeout(stats):
+    crawler = _run(_config(quick_nav=True))
+    evidence, errors = crawler.get_results()
+
+    assert errors == []
+    assert len(evidence) == 2
+    assert stats["wait_until"] == "commit"
+    assert stats["load_waits"] == len(SITE)
+
+
+class FakeRoute:
+    def __init__(self, resource_type):
+        self.request = type("Req", (), {"resource_type": resource_type})()
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+@pytest.mark.parametrize(
+    "resource_type, outcome",
+    [
+        ("document", "continue"),
+        ("script", "continue"),
+        ("xhr", "continue"),
+        ("image", "abort"),
+        ("stylesheet", "abort"),
+        ("font", "abort"),
+        ("media", "abort"),
+    ],
+)
+def test_subresource_blocking(resource_type, outcome):
+    route = FakeRoute(resource_type)
+    asyncio.run(pw_module._block_subresources(route))
+    assert route.outcome == outcome
+
+
+def test_neighbor_shared_by_two_pivots_is_listed_under_the_first(stats, monkeypatch):
+    shared = '<a href="https://c.example/shared">c</a>'
+    monkeypatch.setitem(
+        SITE, "https://p1.example/me", SITE["https://p1.example/me"] + shared
+    )
+    monkeypatch.setitem(
+        SITE, "https://p2.example/me", SITE["https://p2.example/me"] + shared
+    )
+    monkeypatch.setitem(SITE, "https://c.example/shared", "<p>leaf</p>")
+
+    crawler = _run(_config())
+
+    assert stats["visits"].count("https://c.example/shared") == 1
+    pivot = crawler.parent["https://c.example/shared"]
+    assert pivot in {"https://p1.example/me", "https://p2.example/me"}
+    assert crawler.pivot_outlinked == {pivot: {"https://c.example/shared"}}
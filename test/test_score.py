@@ -1,7 +1,7 @@
 import pytest
 
 from naive_backlink.models import EvidenceRecord, URLContext
-from naive_backlink.scoring import calculate_score
+from naive_backlink.scoring import calculate_score, calculate_scores_batch
 
 # --- helpers ---------------------------------------------------------------
 
@@ -100,3 +100,28 @@ def test_one_weak_plus_indirect_stays_low():
     score, label = calculate_score(ev)
     assert score == 35
     assert label == "low"
+
+
+def test_batch_scoring_matches_per_origin_scoring():
+    batches = [
+        [],
+        [_ev("strong")],
+        [_ev("weak", i + 1) for i in range(3)],
+        [_ev("weak", 1)] + [_ev("indirect", i + 1) for i in range(7)],
+        [_ev("strong")] + [_ev("weak", i + 1) for i in range(3)],
+        [_ev("weak", i + 1) for i in range(10)],  # same saturated counts as #3
+    ]
+    assert calculate_scores_batch(batches) == [calculate_score(b) for b in batches]
+    assert calculate_scores_batch(iter(b) for b in batches)[1] == (85, "high")
+
+
+def test_score_accepts_a_single_pass_iterable():
+    evidence = [_ev("strong")] + [_ev("weak", i + 1) for i in range(2)]
+    assert calculate_score(ev for ev in evidence) == calculate_score(evidence)
+
+
+def test_score_counts_equal_but_not_interned_classifications():
+    # e.g. records decoded from JSON by a caller: equal strings, other objects.
+    weak = "".join(["we", "ak"])
+    evidence = [_ev(weak, 1), _ev(weak, 2)]
+    assert calculate_score(evidence) == calculate_score([_ev("weak", 1)] * 2)
@@ -0,0 +1,142 @@
+import io
+
+from naive_backlink.cli import _build_link_graph_inputs
+from naive_backlink.models import EvidenceRecord, Result, URLContext
+from naive_backlink.ui import (
+    render_errors_section,
+    render_evidence_section,
+    render_link_graph_section,
+    render_report,
+    render_score_line,
+    render_verify_header,
+)
+
+
+class CountingWriter(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+def _ev(cls, url, notes=""):
+    return EvidenceRecord(
+        id="e",
+        kind="backlink",
+        source=URLContext(url="https://a.example", context="origin-page"),
+        target=URLContext(url=url, context="candidate-page"),
+        classification=cls,
+        notes=notes,
+    )
+
+
+def _result(evidence=(), errors=()):
+    return Result(
+        origin_url="https://a.example",
+        score=85,
+        label="high",
+        evidence=list(evidence),
+        errors=list(errors),
+    )
+
+
+def test_header_and_score_line():
+    out = io.StringIO()
+    render_verify_header("https://a.example", file=out)
+    render_score_line(_result(), file=out)
+    assert out.getvalue() == (
+        "Verifying backlinks for: https://a.example...\n\nScore: 85 (high)\n"
+    )
+
+
+def test_evidence_section_is_written_in_one_call():
+    out = CountingWriter()
+    result = _result([_ev("strong", "https://b.example"), _ev(None, "https://c.x")])
+    render_evidence_section(result, file=out)
+    assert out.getvalue() == (
+        "\n--- Evidence Found ---\n"
+        "- [STRONG  ] on: https://b.example\n"
+        "- [        ] on: https://c.x\n"
+    )
+    assert out.writes == 1
+
+
+def test_evidence_labels_are_padded_for_known_and_unknown_classes():
+    out = io.StringIO()
+    result = _result([_ev("indirect", "https://b.example"), _ev("Odd", "https://c.x")])
+    render_evidence_section(result, file=out)
+    assert out.getvalue().splitlines()[2:] == [
+        "- [INDIRECT] on: https://b.example",
+        "- [ODD     ] on: https://c.x",
+    ]
+
+
+def test_link_graph_inputs_are_deduped_and_sorted_once():
+    via_b = "pivot=https://b.example chain=A<->B<->C"
+    result = _result(
+        [
+            _ev("weak", "https://c.example"),
+            _ev("strong", "https://b.example"),
+            _ev("weak", "https://c.example"),
+            _ev("indirect", "https://z.example", via_b),
+            _ev("indirect", "https://y.example", via_b),
+        ]
+    )
+    assert _build_link_graph_inputs(result) == (
+        "https://a.example",
+        ["https://b.example", "https://c.example"],
+        {"https://b.example": ["https://y.example", "https://z.example"]},
+    )
+
+
+def test_link_graph_section_renders_in_given_order():
+    out = CountingWriter()
+    render_link_graph_section(
+        "https://a.example",
+        ["https://b.example", "https://c.example"],
+        {
+            "https://b.example": ["https://y.example", "https://z.example"],
+            "https://c.example": [],
+        },
+        file=out,
+    )
+    assert out.getvalue() == (
+        "\n--- Link Graph ---\n"
+        "https://a.example\n"
+        "├─ https://b.example  [direct]\n"
+        "│  └─ https://y.example  [indirect via https://b.example]\n"
+        "│  └─ https://z.example  [indirect via https://b.example]\n"
+        "├─ https://c.example  [direct]\n"
+    )
+    assert out.writes == 1
+
+
+def test_errors_section():
+    out = CountingWriter()
+    render_errors_section(iter(["boom", "bang"]), file=out)
+    assert out.getvalue() == "\n--- Errors Encountered ---\n- boom\n- bang\n"
+    assert out.writes == 1
+
+
+def test_empty_sections_write_nothing():
+    out = CountingWriter()
+    render_evidence_section(_result(), file=out)
+    render_link_graph_section(None, ["https://b.example"], {}, file=out)
+    render_errors_section([], file=out)
+    assert out.getvalue() == ""
+    assert out.writes == 0
+
+
+def test_render_report_concatenates_the_sections():
+    result = _result([_ev("strong", "https://b.example")], errors=["boom"])
+    graph = _build_link_graph_inputs(result)
+    expected = io.StringIO()
+    render_score_line(result, file=expected)
+    render_evidence_section(result, file=expected)
+    render_link_graph_section(*graph, file=expected)
+    render_errors_section(result.errors, file=expected)
+    assert render_report(result, *graph) == expected.getvalue()
+    assert "--- Errors Encountered ---" in expected.getvalue()